@@ -0,0 +1,57 @@
+"""
+Benchmark suite. 
+
+Usage: 
+    python -m benchmarks run [--quick] [--scene NAME ...] [--out results.json]
+    python -m benchmarks compare baseline.json results.json [--tolerance 0.1] [--allow-missing]
+"""
+import argparse
+import sys
+
+from . import runner, scenes
+
+def main() -> int: 
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks. ")
+    run_parser.add_argument("--scene", action="append", choices=list(scenes.SCENES), help="Scene to run, repeatable. ")
+    run_parser.add_argument("--quick", action="store_true", help="Only run the small scenes. ")
+    run_parser.add_argument("--warmup", type=int, default=1)
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--out", type=str, default=None, help="Write the results as JSON. ")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions against a baseline. ")
+    compare_parser.add_argument("baseline", type=str)
+    compare_parser.add_argument("current", type=str)
+    compare_parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative slowdown of the median. ")
+    compare_parser.add_argument("--allow-missing", action="store_true", help="Only warn about baseline cases missing from the results. ")
+
+    args = parser.parse_args()
+
+    if args.command == "run": 
+        names = args.scene or (scenes.QUICK_SCENES if args.quick else None)
+        results = runner.run(names=names, warmup=args.warmup, repeat=args.repeat, seed=args.seed)
+        print(f"{'case':<28} {'median':>10} {'min':>10} {'stdev':>10}")
+        for case, stats in results["results"].items(): 
+            print(f"{case:<28} {stats['median'] * 1e3:>8.2f}ms {stats['min'] * 1e3:>8.2f}ms {stats['stdev'] * 1e3:>8.2f}ms")
+        if args.out: 
+            runner.save(results, args.out)
+        return 0
+
+    baseline, current = runner.read(args.baseline), runner.read(args.current)
+    rows = runner.compare(baseline, current, args.tolerance)
+    print(f"{'case':<28} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for case, before, after, ratio, regressed in rows: 
+        print(f"{case:<28} {before * 1e3:>8.2f}ms {after * 1e3:>8.2f}ms {ratio:>6.2f}x" + ("  REGRESSION" if regressed else ""))
+    # a case that stopped running must not pass as a case without regression
+    missing = runner.missing(baseline, current)
+    for case in missing: 
+        print(f"{case:<28} {baseline['results'][case]['median'] * 1e3:>8.2f}ms {'-':>10} {'-':>7}  MISSING")
+    if missing and args.allow_missing: 
+        print(f"Warning: {len(missing)} baseline cases missing from the results", file=sys.stderr)
+    return 1 if any(row[4] for row in rows) or (missing and not args.allow_missing) else 0
+
+if __name__ == '__main__': 
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark of the checked Vector/Matrix arithmetic against the compact types. 
+
+Usage: python -m benchmarks.micro_ops [-n NUMBER]
+"""
+import argparse
+import timeit
+
+from libs.ops import Vector, Matrix, Vec2, Mat2
+from libs.engine import Buffer
+
+def distance_vector(): 
+    p, a, b = Vector(elements=[3, 4]), Vector(elements=[0., 0.]), Vector(elements=[10., 2.])
+    length = (b - a).norm()
+    t = (a - p).dot_product(input_=a - b) / length ** 2
+    p_prime = a + max(0, min(1, t)) * (b - a)
+    return (p - p_prime).norm()
+
+def distance_compact(): 
+    p, a, b = Vec2(3, 4), Vec2(0., 0.), Vec2(10., 2.)
+    length = (b - a).norm()
+    t = (a - p).dot_product(input_=a - b) / length ** 2
+    p_prime = a + max(0, min(1, t)) * (b - a)
+    return (p - p_prime).norm()
+
+def distance_scalar(): 
+    return Buffer.point_to_segment_distance(3, 4, 0., 0., 10., 2.)
+
+MATRIX = Matrix.scaling_matrix(a=2., b=3.) * Matrix.rotation_matrix(0.3)
+OFFSET = Vector(elements=[1., 2.])
+MAT2, VEC2 = Mat2.from_matrix(MATRIX), Vec2.from_vector(OFFSET)
+
+def transform_vector(): 
+    return MATRIX * Vector(elements=[1., 1.]) + OFFSET
+
+def transform_compact(): 
+    return MAT2 * Vec2(1., 1.) + VEC2
+
+def matmul_matrix(): 
+    return MATRIX * MATRIX
+
+def matmul_compact(): 
+    return MAT2 * MAT2
+
+CASES = [
+    ("point-to-segment distance", distance_vector, distance_compact), 
+    ("point-to-segment distance (scalar)", distance_vector, distance_scalar), 
+    ("2x2 transform + translation", transform_vector, transform_compact), 
+    ("2x2 matrix product", matmul_matrix, matmul_compact), 
+]
+
+def main() -> None: 
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=100000, help="Calls per measurement. ")
+    args = parser.parse_args()
+
+    print(f"{'case':<36} {'checked':>12} {'compact':>12} {'speedup':>8}")
+    for name, checked, compact in CASES: 
+        t_checked = min(timeit.repeat(checked, number=args.number, repeat=3))
+        t_compact = min(timeit.repeat(compact, number=args.number, repeat=3))
+        print(f"{name:<36} {t_checked / args.number * 1e9:>10.0f}ns {t_compact / args.number * 1e9:>10.0f}ns {t_checked / t_compact:>7.1f}x")
+
+if __name__ == '__main__': 
+    main()
@@ -0,0 +1,102 @@
+"""Time the parse, transform, rasterize and display stages on synthetic scenes."""
+import io
+import json
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from libs.engine import ScriptLoader, Buffer
+from . import scenes
+
+def measure(func, setup=None, warmup: int=1, repeat: int=5) -> dict: 
+    """Time func(setup()) repeat times after warmup runs, setup is not timed"""
+    timings = []
+    for run in range(warmup + repeat): 
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(argument)
+        elapsed = time.perf_counter() - start
+        if run >= warmup: 
+            timings.append(elapsed)
+    return {
+        "min": min(timings), 
+        "median": statistics.median(timings), 
+        "mean": statistics.mean(timings), 
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0., 
+        "max": max(timings), 
+        "repeat": repeat, 
+    }
+
+def load(path: str) -> ScriptLoader: 
+    script_loader = ScriptLoader(filename=path)
+    script_loader.read_script()
+    return script_loader
+
+def rendered(script_loader: ScriptLoader) -> Buffer: 
+    buffer = Buffer(*script_loader.get_size())
+    buffer.render(script_loader.get_shapes())
+    return buffer
+
+def draw_per_segment(script_loader: ScriptLoader) -> None: 
+    buffer = Buffer(*script_loader.get_size())
+    for shape in script_loader.get_shapes(): 
+        shape.draw(canvas=buffer)
+
+def stages(path: str, warmup: int, repeat: int) -> dict: 
+    """Benchmark every stage on one script"""
+    script_loader = load(path)
+    return {
+        "parse": measure(lambda _: load(path), warmup=warmup, repeat=repeat), 
+        # apply the lazy transforms to every vertex
+        "transform": measure(lambda loader: [shape.vertex_array for shape in loader.get_shapes()], 
+                             setup=lambda: script_loader, warmup=warmup, repeat=repeat), 
+        "draw_line": measure(draw_per_segment, setup=lambda: script_loader, warmup=warmup, repeat=repeat), 
+        "render": measure(rendered, setup=lambda: script_loader, warmup=warmup, repeat=repeat), 
+        "display": measure(lambda buffer: buffer.display(mode='square', stream=io.StringIO()), 
+                           setup=lambda: rendered(script_loader), warmup=warmup, repeat=repeat), 
+    }
+
+def run(names: list[str]=None, warmup: int=1, repeat: int=5, seed: int=0) -> dict: 
+    """Benchmark the named scenes, all of them by default"""
+    names = list(scenes.SCENES) if names is None else names
+    results = {}
+    with tempfile.TemporaryDirectory() as directory: 
+        for name in names: 
+            path = scenes.write_script(directory, name, seed=seed)
+            for stage, stats in stages(path, warmup, repeat).items(): 
+                results[f"{name}/{stage}"] = stats
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"), 
+            "python": platform.python_version(), 
+            "platform": platform.platform(), 
+            "seed": seed, 
+            "scenes": {name: scenes.SCENES[name] for name in names}, 
+        }, 
+        "results": results, 
+    }
+
+def compare(baseline: dict, current: dict, tolerance: float=0.1) -> list[tuple]: 
+    """Get (case, baseline median, current median, ratio, regressed) for the cases found in both"""
+    rows = []
+    for case, stats in current["results"].items(): 
+        if case not in baseline["results"]: 
+            continue
+        before, after = baseline["results"][case]["median"], stats["median"]
+        ratio = after / before if before else float("inf")
+        rows.append((case, before, after, ratio, ratio > 1 + tolerance))
+    return rows
+
+def missing(baseline: dict, current: dict) -> list[str]: 
+    """Get the baseline cases without a current result"""
+    return [case for case in baseline["results"] if case not in current["results"]]
+
+def save(results: dict, path: str) -> None: 
+    with open(path, 'w') as file_handler: 
+        json.dump(results, file_handler, indent=2)
+
+def read(path: str) -> dict: 
+    with open(path, 'r') as file_handler: 
+        return json.load(file_handler)
@@ -0,0 +1,33 @@
+"""Synthetic scene scripts for the benchmarks."""
+import os
+import random
+
+# name -> canvas height, canvas width, number of shapes, sides per shape
+SCENES = {
+    "small": (48, 64, 10, 4), 
+    "many-shapes": (200, 200, 400, 5), 
+    "many-sides": (200, 200, 40, 64), 
+    "large-canvas": (800, 800, 100, 6), 
+}
+
+QUICK_SCENES = ["small", "many-shapes"]
+
+def script_lines(height: int, width: int, num_shapes: int, num_sides: int, seed: int=0) -> list[str]: 
+    """Lines of a script with randomly placed shapes, reproducible for a seed"""
+    rng = random.Random(seed)
+    lines = [f"{height} {width}"]
+    for _ in range(num_shapes): 
+        scale = rng.uniform(2, max(3, min(height, width) / 8))
+        lines.append(" ".join(str(x) for x in [
+            num_sides, round(scale, 3), round(scale * rng.uniform(0.5, 1.5), 3), rng.randint(0, 359), 
+            round(rng.uniform(0, height), 3), round(rng.uniform(0, width), 3)
+        ]))
+    return lines
+
+def write_script(directory: str, name: str, seed: int=0) -> str: 
+    """Write the named scene into directory and get its path"""
+    height, width, num_shapes, num_sides = SCENES[name]
+    path = os.path.join(directory, f"{name}.txt")
+    with open(path, 'w') as file_handler: 
+        file_handler.write("\n".join(script_lines(height, width, num_shapes, num_sides, seed)) + "\n")
+    return path
@@ -1,2 +1,16 @@
 from .script_loader import ScriptLoader
-from .buffer import Buffer
\ No newline at end of file
+from .buffer import Buffer
+from .numpy_buffer import NumpyBuffer, HAS_NUMPY
+from .parallel import ParallelRenderer
+from .writers import encode, write_image
+from .scene import Scene
+from .spatial_index import SegmentGrid
+from .animation import Animation, AnimationLoader, Track
+from .profiling import Profiler, run_with_hooks
+from .batch import BatchRenderer, collect_scripts
+from .scene_cache import SceneCache
+from .packed_buffer import PackedBuffer
+from .streaming import StreamRenderer, stdin_lines, socket_lines, stream_writer
+from .coverage_buffer import CoverageBuffer
+from .live_display import LiveDisplay
+from .diagnostics import ErrorContext, Diagnostic, Diagnostics, LogWriter
\ No newline at end of file
@@ -0,0 +1,142 @@
+from collections import OrderedDict
+
+from .buffer import Buffer
+from .script_loader import ScriptLoader
+from .diagnostics import ErrorContext
+
+class Track:
+    """Keyframed pose (scale-x, scale-y, rot-degree, position-x, position-y) of one shape"""
+    def __init__(self, num_sides: int, pose: list, fill: int=0) -> None:
+        self.num_sides = num_sides
+        # fill code of the script, constant over the frames
+        self.fill = fill
+        self.keyframes = {0: tuple(pose)}
+
+    def add_keyframe(self, frame: int, pose: list) -> None: 
+        self.keyframes[frame] = tuple(pose)
+
+    def is_static(self) -> bool: 
+        return len(set(self.keyframes.values())) == 1
+
+    def pose(self, frame: int) -> tuple: 
+        """Linearly interpolate the pose, holding the first and last keyframes"""
+        frames = sorted(self.keyframes)
+        if frame <= frames[0]: 
+            return self.keyframes[frames[0]]
+        if frame >= frames[-1]: 
+            return self.keyframes[frames[-1]]
+        for start, stop in zip(frames, frames[1:]): 
+            if start <= frame <= stop: 
+                t = (frame - start) / (stop - start)
+                return tuple(a + t * (b - a) for a, b in zip(self.keyframes[start], self.keyframes[stop]))
+
+    def shape(self, frame: int): 
+        return ScriptLoader.build_shape([self.num_sides, *self.pose(frame), self.fill])
+
+
+class AnimationLoader(ScriptLoader):
+    """
+    Script with keyframes. A shape line gives the pose at frame 0, and following lines 
+    "@ frame scale-x scale-y rot-degree position-x position-y" add keyframes to that shape. 
+    """
+    def __init__(self, filename, use_mmap: bool=False) -> None:
+        super().__init__(filename=filename, use_mmap=use_mmap)
+        self.tracks = []
+        # set while the last shape line read was rejected, its keyframes have no track
+        self.orphaned = False
+
+    @staticmethod
+    def is_animation(filename: str) -> bool: 
+        """Whether a script has keyframe lines, False if it cannot be read"""
+        try: 
+            with open(filename, 'r') as file_handler: 
+                return any(line.lstrip().startswith('@') for line in file_handler)
+        except OSError: 
+            return False
+
+    @staticmethod
+    def keyframe_check(line: list, idx: int) -> None: 
+        if len(line) != 6: 
+            raise ValueError(f"Invalid keyframe in line {idx+1}: incorrect number of parameters. ")
+        if any(not isinstance(x, (int, float)) for x in line): 
+            raise ValueError(f"Invalid keyframe in line {idx+1}: invalid input. ")
+        if not isinstance(line[0], int) or line[0] < 0: 
+            raise ValueError(f"Invalid keyframe in line {idx+1}: frame should be a non-negative integer. ")
+
+    def parse_line(self, line: str, idx: int) -> list: 
+        tokens = line.split()
+        if tokens[0] != '@': 
+            self.orphaned = True
+            return super().parse_line(line, idx)
+        keyframe = [ScriptLoader.parse_token(x) for x in tokens[1:]]
+        AnimationLoader.keyframe_check(keyframe, idx)
+        return ['@'] + keyframe
+
+    def read_animation(self, on_error=None) -> list[Track]: 
+        """Read the script into tracks, errors go to on_error(exception, traceback_details)"""
+        report = on_error if on_error is not None else lambda exception, traceback_details: None
+        for idx, line in self.iter_records(on_error=on_error): 
+            if idx == 0: 
+                continue
+            if line[0] != '@': 
+                self.tracks.append(Track(num_sides=int(line[0]), pose=line[1:6], fill=line[6] if len(line) == 7 else 0))
+                self.orphaned = False
+            elif not self.tracks or self.orphaned: 
+                try: 
+                    reason = "its shape line was rejected" if self.orphaned else "no shape to animate"
+                    raise ValueError(f"Invalid keyframe in line {idx+1}: {reason}. ")
+                except ValueError as e: 
+                    report(f"Error in reading script: {e}", ErrorContext.capture(line=idx + 1, code="bad-keyframe"))
+            else: 
+                self.tracks[-1].add_keyframe(line[1], line[2:])
+        return self.tracks
+
+
+class Animation:
+    """
+    Renders frames of keyframed tracks. Static tracks are drawn once into a background layer, 
+    each frame copies it and draws only the moving tracks. Frames are kept in a bounded LRU cache. 
+    """
+    def __init__(self, height: int, width: int, tracks: list[Track], threshold: float=0.5, 
+                 backend: str="python", cache_size: int=16) -> None:
+        self.height, self.width = height, width
+        self.threshold = threshold
+        self.backend = backend
+        self.static = [track for track in tracks if track.is_static()]
+        self.moving = [track for track in tracks if not track.is_static()]
+        self.background = None
+        self.cache = OrderedDict()  # poses of the moving tracks -> frame
+        self.cache_size = cache_size
+        self.hits, self.misses = 0, 0
+
+    @staticmethod
+    def from_loader(animation_loader: AnimationLoader, **kwargs): 
+        height, width = animation_loader.get_size()
+        return Animation(height=height, width=width, tracks=animation_loader.tracks, **kwargs)
+
+    def render_background(self) -> Buffer: 
+        if self.background is None: 
+            self.background = Buffer.create(height=self.height, width=self.width, backend=self.backend)
+            self.background.render((track.shape(0) for track in self.static), self.threshold)
+        return self.background
+
+    def frame(self, index: int) -> Buffer: 
+        """Get frame index, the result is shared with the cache and must not be modified"""
+        # frames where nothing moved since a cached one are reused as they are
+        key = tuple(track.pose(index) for track in self.moving)
+        if key in self.cache: 
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        self.misses += 1
+        frame = self.render_background().copy()
+        frame.render((ScriptLoader.build_shape([track.num_sides, *pose, track.fill]) for track, pose in zip(self.moving, key)), self.threshold)
+        self.cache[key] = frame
+        while len(self.cache) > self.cache_size: 
+            self.cache.popitem(last=False)
+        return frame
+
+    def frames(self, count: int): 
+        """Yield (index, frame) for frames 0 to count - 1"""
+        for index in range(count): 
+            yield index, self.frame(index)
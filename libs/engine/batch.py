@@ -0,0 +1,136 @@
+import os
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .buffer import Buffer
+from .script_loader import ScriptLoader
+from .writers import write_image
+from .scene_cache import SceneCache
+from .animation import Animation, AnimationLoader
+from .diagnostics import ErrorContext
+
+def collect_scripts(source: str) -> list[str]: 
+    """
+    Get the script paths of a batch source: every .txt file of a directory, 
+    a manifest file listing one path per line (relative to the manifest), or a glob pattern. 
+    """
+    if os.path.isdir(source): 
+        return sorted(glob.glob(os.path.join(source, "*.txt")))
+    if os.path.isfile(source) and not source.endswith(".txt"): 
+        directory = os.path.dirname(source)
+        with open(source, 'r') as file_handler: 
+            lines = [line.strip() for line in file_handler]
+        return [os.path.join(directory, line) for line in lines if line and not line.startswith('#')]
+    return sorted(glob.glob(source))
+
+def render_scene(script_path: str, on_error, backend: str, cache_dir: str, cache_bytes: int) -> Buffer: 
+    script_loader = ScriptLoader(filename=script_path)
+    cache = SceneCache(cache_dir, max_bytes=cache_bytes) if cache_dir is not None else None
+    key = cache.loader_key(script_loader) if cache is not None else None
+    if key is not None: 
+        shapes = cache.load_script(script_loader, on_error=on_error, key=key)
+    else: 
+        shapes = script_loader.stream_shapes(on_error=on_error)
+    buffer = Buffer.create(*script_loader.get_size(), backend=backend)
+    # repeated scripts skip straight to output
+    if key is None or not cache.load_frame(key, buffer): 
+        buffer.render(shapes)
+        if key is not None: 
+            cache.store_frame(key, buffer)
+    return buffer
+
+def render_one(script_path: str, output_path: str, log_path: str, logger_factory, backend: str="python", 
+               cache_dir: str=None, cache_bytes: int=64 << 20) -> dict: 
+    """
+    Worker: render one script to output_path, logging its errors to log_path through logger_factory(log_path). 
+    Keyframed scripts are rendered at frame 0. 
+    """
+    start = time.perf_counter()
+    logger = logger_factory(log_path)
+    errors = 0
+
+    def on_error(exception: str, traceback_details: ErrorContext): 
+        nonlocal errors
+        errors += 1
+        logger(exception, traceback_details)
+
+    try: 
+        if AnimationLoader.is_animation(script_path): 
+            animation_loader = AnimationLoader(filename=script_path)
+            animation_loader.read_animation(on_error=on_error)
+            buffer = Animation.from_loader(animation_loader, backend=backend).frame(0)
+        else: 
+            buffer = render_scene(script_path, on_error, backend, cache_dir, cache_bytes)
+        write_image(buffer, output_path)
+    except Exception as e: 
+        on_error(f"Error in rendering script: {e}", ErrorContext.capture(code="render-failed"))
+        return {"script": script_path, "output": None, "errors": errors, "ok": False, 
+                "seconds": time.perf_counter() - start}
+    finally: 
+        # loggers holding their log file open are closed with the script
+        if hasattr(logger, "close"): 
+            logger.close()
+    return {"script": script_path, "output": output_path, "errors": errors, "ok": True, 
+            "seconds": time.perf_counter() - start}
+
+
+class BatchRenderer: 
+    """Render many scripts on a pool of worker processes, each with its own output and error log"""
+    def __init__(self, jobs: int, logger_factory, output_format: str=".png", backend: str="python", 
+                 cache_dir: str=None, cache_bytes: int=64 << 20) -> None:
+        if not isinstance(jobs, int) or jobs <= 0: 
+            raise ValueError(f"Number of jobs should be an integer greater than zero, got {jobs}. ")
+        self.jobs = jobs
+        self.logger_factory = logger_factory
+        self.output_format = output_format if output_format.startswith('.') else '.' + output_format
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.cache_bytes = cache_bytes
+
+    def targets(self, script_path: str, output_dir: str, root: str=None) -> tuple[str, str]: 
+        """Output and log paths of a script, placed in output_dir as the script is in root, its own directory by default"""
+        root = os.path.dirname(os.path.abspath(script_path)) if root is None else root
+        stem = os.path.splitext(os.path.relpath(os.path.abspath(script_path), root))[0]
+        return os.path.join(output_dir, stem + self.output_format), os.path.join(output_dir, stem + ".log")
+
+    def plan(self, script_paths: list[str], output_dir: str) -> list[tuple[str, str, str]]: 
+        """
+        (script, output, log) paths of a batch. The outputs keep the directories of the scripts 
+        below their common directory, so that scripts of the same name do not overwrite each other. 
+        """
+        if not script_paths: 
+            return []
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(script_path)) for script_path in script_paths])
+        plan, scripts = [], {}
+        for script_path in script_paths: 
+            output_path, log_path = self.targets(script_path, output_dir, root)
+            if output_path in scripts: 
+                raise ValueError(f"Scripts {scripts[output_path]} and {script_path} would both render to {output_path}. ")
+            scripts[output_path] = script_path
+            plan.append((script_path, output_path, log_path))
+        return plan
+
+    def run(self, script_paths: list[str], output_dir: str): 
+        """Yield the result of every script as soon as it completes"""
+        plan = self.plan(script_paths, output_dir)
+        for directory in {os.path.dirname(output_path) for _, output_path, _ in plan} | {output_dir}: 
+            os.makedirs(directory, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool: 
+            futures = [
+                pool.submit(
+                    render_one, script_path, output_path, log_path, 
+                    self.logger_factory, self.backend, self.cache_dir, self.cache_bytes
+                ) 
+                for script_path, output_path, log_path in plan
+            ]
+            for future in as_completed(futures): 
+                yield future.result()
+
+    @staticmethod
+    def summarize(results: list[dict], seconds: float) -> str: 
+        rendered = sum(1 for result in results if result["ok"])
+        errors = sum(result["errors"] for result in results)
+        rate = len(results) / seconds if seconds > 0 else float("inf")
+        return (f"Rendered {rendered}/{len(results)} scripts, {len(results) - rendered} failed, "
+                f"{errors} script errors logged, {seconds:.2f}s ({rate:.1f} scripts/s)")
@@ -1,15 +1,58 @@
-from ..ops import Vector
+import sys
+from math import floor, ceil
+from collections import Counter
+from ..ops import Vector, Vec2
+from .clipping import clip_segment, inside
 
 class Buffer:
-    def __init__(self, height: int, width: int) -> None:
+    # available rasterizers: "exact" tests every pixel of the canvas, 
+    # "bbox" only tests pixels around the segment and gives the same result
+    RASTERIZERS = ["exact", "bbox"]
+    # available storage backends, "auto" picks numpy when it is installed, 
+    # "packed" stores 1 bit per pixel, "coverage" 8-bit anti-aliased coverage
+    BACKENDS = ["auto", "python", "numpy", "packed", "coverage"]
+    # value of a fully set pixel
+    max_value = 1
+    # winding rules of filled polygons
+    FILL_RULES = ["evenodd", "nonzero"]
+
+    def __init__(self, height: int, width: int, rasterizer: str="bbox") -> None:
+        if rasterizer not in Buffer.RASTERIZERS: 
+            raise ValueError(f"Unspecified rasterizer {rasterizer}, expected one of {Buffer.RASTERIZERS}. ")
         # Initialize the buffer
-        self.data = [[0 for _ in range(width)] for _ in range(height)]
+        self.data = self.new_storage(height, width)
         self.height = height
         self.width = width
+        self.rasterizer = rasterizer
+        # culled shapes, clipped and rejected segments
+        self.clip_counts = Counter()
+
+    @staticmethod
+    def create(height: int, width: int, backend: str="auto", rasterizer: str="bbox"): 
+        """Create a buffer with the given storage backend"""
+        from .numpy_buffer import NumpyBuffer, HAS_NUMPY
+        from .packed_buffer import PackedBuffer
+        from .coverage_buffer import CoverageBuffer
+        if backend not in Buffer.BACKENDS: 
+            raise ValueError(f"Unspecified backend {backend}, expected one of {Buffer.BACKENDS}. ")
+        if backend == "packed": 
+            return PackedBuffer(height=height, width=width, rasterizer=rasterizer)
+        if backend == "coverage": 
+            return CoverageBuffer(height=height, width=width, rasterizer=rasterizer)
+        if backend == "numpy" or (backend == "auto" and HAS_NUMPY): 
+            return NumpyBuffer(height=height, width=width, rasterizer=rasterizer)
+        return Buffer(height=height, width=width, rasterizer=rasterizer)
+
+    def new_storage(self, height: int, width: int): 
+        """Allocate the pixel rows, indexed as data[i][j]"""
+        return [[0 for _ in range(width)] for _ in range(height)]
         
     @staticmethod
     def point_to_line_distance(p: Vector, a: Vector, b: Vector) -> float:
         """Calculate the minimum distance from pixel p to the line segment ab. """
+        # 2D inputs are validated once here and computed with the compact types
+        if p.dim == 2 and a.dim == 2 and b.dim == 2: 
+            p, a, b = Vec2.from_vector(p), Vec2.from_vector(a), Vec2.from_vector(b)
         # Calculate the length of the given line segment
         length = (b - a).norm()
         # Check if the two endpoints are identical
@@ -24,24 +67,211 @@ class Buffer:
         # Calculate the distance from pixel to the line segment
         return (p - p_prime).norm()
 
-    def draw_line(self, p_a: Vector, p_b: Vector, threshold:float=0.5) -> None:
-        """Draw pixel on buffer"""
+    @staticmethod
+    def point_to_segment_distance(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+        """
+        Scalar form of point_to_line_distance. 
+        The operations are evaluated in the same order, so both give the same float. 
+        """
+        dx, dy = bx - ax, by - ay
+        length = (dx ** 2 + dy ** 2) ** .5
+        if length == 0:
+            return ((ax - px) ** 2 + (ay - py) ** 2) ** .5
+        t = ((ax - px) * (ax - bx) + (ay - py) * (ay - by)) / length ** 2
+        t_prime = max(0, min(1, t))
+        qx, qy = ax + t_prime * dx, ay + t_prime * dy
+        return ((px - qx) ** 2 + (py - qy) ** 2) ** .5
+
+    def reach(self, threshold: float=0.5) -> float:
+        """Distance from a segment within which its pixels may be drawn"""
+        return threshold
+
+    def viewport(self, threshold: float=0.5) -> tuple:
+        """
+        Get the (x min, x max, y min, y max) rect of the points which may lie within the 
+        threshold of a pixel, with one pixel of slack. 
+        """
+        margin = threshold + 1
+        return 1 - margin, self.height + margin, -margin, self.width - 1 + margin
+
+    def visible(self, segments: list, threshold: float=0.5) -> bool:
+        """Check whether the bounding box of a shape's segments meets the viewport, counting culled shapes"""
+        if not segments:
+            return False
+        x_min, x_max, y_min, y_max = self.viewport(threshold)
+        if (max(max(ax, bx) for ax, _, bx, _ in segments) < x_min or min(min(ax, bx) for ax, _, bx, _ in segments) > x_max or 
+                max(max(ay, by) for _, ay, _, by in segments) < y_min or min(min(ay, by) for _, ay, _, by in segments) > y_max):
+            self.clip_counts["shapes culled"] += 1
+            return False
+        return True
+
+    def segment_window(self, ax: float, ay: float, bx: float, by: float, threshold: float=0.5, region: tuple=None):
+        """
+        Get the pixel window (first row, last row, first col, last col) which may lie 
+        within the threshold of segment ab, or None if it misses the buffer. 
+        A region window restricts the result further. 
+        """
+        # segments leaving the viewport only span the window of their part inside it, 
+        # the pixels are still tested against the whole segment
+        viewport = self.viewport(threshold)
+        if not (inside(ax, ay, viewport) and inside(bx, by, viewport)):
+            clipped = clip_segment(ax, ay, bx, by, viewport)
+            if clipped is None:
+                self.clip_counts["segments rejected"] += 1
+                return None
+            self.clip_counts["segments clipped"] += 1
+            ax, ay, bx, by = clipped
+        # pixel (i, j) sits at point (height - i, j), one pixel of slack absorbs rounding
+        i_lo = max(0, floor(self.height - max(ax, bx) - threshold) - 1)
+        i_hi = min(self.height - 1, ceil(self.height - min(ax, bx) + threshold) + 1)
+        j_lo = max(0, floor(min(ay, by) - threshold) - 1)
+        j_hi = min(self.width - 1, ceil(max(ay, by) + threshold) + 1)
+        if region is not None: 
+            return Buffer.intersect_windows((i_lo, i_hi, j_lo, j_hi), region)
+        if i_lo > i_hi or j_lo > j_hi: 
+            return None
+        return i_lo, i_hi, j_lo, j_hi
+
+    @staticmethod
+    def intersect_windows(window: tuple, other: tuple): 
+        """Get the overlap of two pixel windows, or None"""
+        i_lo, i_hi = max(window[0], other[0]), min(window[1], other[1])
+        j_lo, j_hi = max(window[2], other[2]), min(window[3], other[3])
+        if i_lo > i_hi or j_lo > j_hi: 
+            return None
+        return i_lo, i_hi, j_lo, j_hi
+
+    def copy(self):
+        """Get an independent copy of the buffer"""
+        result = Buffer.__new__(type(self))
+        result.__dict__.update(self.__dict__)
+        result.data = self.copy_storage()
+        result.clip_counts = Counter()
+        return result
+
+    def copy_storage(self):
+        return [list(row) for row in self.data]
+
+    def clear(self, region: tuple=None) -> None:
+        """Reset every pixel, or only those of a (first row, last row, first col, last col) window"""
+        i_lo, i_hi, j_lo, j_hi = (0, self.height - 1, 0, self.width - 1) if region is None else region
+        for i in range(i_lo, i_hi + 1):
+            self.data[i][j_lo:j_hi + 1] = [0] * (j_hi - j_lo + 1)
+
+    def draw_segment(self, ax: float, ay: float, bx: float, by: float, threshold: float=0.5, region: tuple=None) -> None:
+        """Draw segment ab given by coordinates, visiting only the pixels around it"""
+        window = self.segment_window(ax, ay, bx, by, threshold, region)
+        if window is None: 
+            return
+        i_lo, i_hi, j_lo, j_hi = window
+        distance = Buffer.point_to_segment_distance
+        for i in range(i_lo, i_hi + 1):
+            row, px = self.data[i], self.height - i
+            for j in range(j_lo, j_hi + 1):
+                if distance(px, j, ax, ay, bx, by) <= threshold:
+                    row[j] = 1
+
+    def draw_segments(self, segments: list, threshold: float=0.5, region: tuple=None) -> None:
+        """Draw a table of (ax, ay, bx, by) segments in a single sweep over the rows"""
+        # bin each segment into the rows its window covers
+        rows = [[] for _ in range(self.height)]
+        for ax, ay, bx, by in segments:
+            window = self.segment_window(ax, ay, bx, by, threshold, region)
+            if window is None:
+                continue
+            i_lo, i_hi, j_lo, j_hi = window
+            entry = (j_lo, j_hi, ax, ay, bx, by)
+            for i in range(i_lo, i_hi + 1):
+                rows[i].append(entry)
+        # each pixel is only tested against the segments that can reach it
+        distance = Buffer.point_to_segment_distance
+        for i, active in enumerate(rows):
+            if not active:
+                continue
+            row, px = self.data[i], self.height - i
+            for j_lo, j_hi, ax, ay, bx, by in active:
+                for j in range(j_lo, j_hi + 1):
+                    if not row[j] and distance(px, j, ax, ay, bx, by) <= threshold:
+                        row[j] = 1
+
+    def fill_span(self, i: int, j_lo: int, j_hi: int) -> None:
+        """Set pixels j_lo to j_hi of row i"""
+        self.data[i][j_lo:j_hi + 1] = [self.max_value] * (j_hi - j_lo + 1)
+
+    def fill_polygon(self, points: list, rule: str="evenodd", region: tuple=None) -> None:
+        """Fill the closed polygon through the (x, y) points with a scanline pass"""
+        from .scanline import polygon_spans
+        if rule not in Buffer.FILL_RULES: 
+            raise ValueError(f"Unspecified fill rule {rule}, expected one of {Buffer.FILL_RULES}. ")
+        for i, j_lo, j_hi in polygon_spans(points, self.height, self.width, rule, region):
+            self.fill_span(i, j_lo, j_hi)
+
+    def render(self, shapes, threshold: float=0.5, chunk_size: int=1 << 16) -> None:
+        """
+        Draw every shape of a scene, collecting all their edges into one segment table. 
+        Shapes may be streamed, the table is swept whenever it reaches chunk_size segments. 
+        """
+        if self.rasterizer == "exact":
+            for shape in shapes:
+                shape.draw(canvas=self)
+            return
+        segments = []
+        for shape in shapes:
+            shape_segments = shape.segments()
+            # shapes entirely off the canvas are dropped before any window is computed
+            if not self.visible(shape_segments, threshold):
+                continue
+            segments.extend(shape_segments)
+            if shape.fill is not None:
+                self.fill_polygon(shape.outline(), shape.fill)
+            if len(segments) >= chunk_size:
+                self.draw_segments(segments, threshold)
+                segments = []
+        self.draw_segments(segments, threshold)
+
+    def merge_mask(self, mask) -> None:
+        """Set every pixel whose byte is non-zero in a row-major height x width byte mask"""
+        mask = bytes(mask)
         for i in range(self.height):
-            for j in range(self.width):
-                # if distance between pixel and line segment within the threshold, render it
-                if Buffer.point_to_line_distance(p=Vector(elements=[self.height - i, j]), a=p_a, b=p_b) <= threshold:
-                    self.data[i][j] = 1
-
-    def display(self, mode="default") -> True:
-        """Display current buffered data"""
-        if mode == "default": 
-            for row in self.data:
-                print(' '.join(str(pixel) for pixel in row))
-            return True
-        elif mode == "square": 
-            for row in self.data:
-                print(' '.join('■' if pixel else '□' for pixel in row))
-            return True
+            row_mask = mask[i * self.width:(i + 1) * self.width]
+            if row_mask.count(0) == self.width:
+                continue
+            row = self.data[i]
+            for j, value in enumerate(row_mask):
+                if value:
+                    row[j] = 1
+
+    def draw_line(self, p_a: Vector, p_b: Vector, threshold:float=0.5, rasterizer: str=None) -> None:
+        """Draw pixel on buffer"""
+        rasterizer = self.rasterizer if rasterizer is None else rasterizer
+        if rasterizer == "exact": 
+            for i in range(self.height):
+                for j in range(self.width):
+                    # if distance between pixel and line segment within the threshold, render it
+                    if Buffer.point_to_line_distance(p=Vector(elements=[self.height - i, j]), a=p_a, b=p_b) <= threshold:
+                        self.data[i][j] = 1
+        elif rasterizer == "bbox": 
+            self.draw_segment(p_a[0], p_a[1], p_b[0], p_b[1], threshold)
         else: 
+            raise ValueError(f"Unspecified rasterizer {rasterizer}, expected one of {Buffer.RASTERIZERS}. ")
+
+    def to_bytes(self, i_lo: int=0, i_hi: int=None) -> bytes:
+        """Get the pixels of rows i_lo to i_hi, all by default, as row-major bytes, one byte per pixel"""
+        i_hi = self.height - 1 if i_hi is None else i_hi
+        return b''.join(bytes(row) for row in self.data[i_lo:i_hi + 1])
+
+    def to_bits(self, i_lo: int=0, i_hi: int=None) -> bytes:
+        """Get the pixels of rows i_lo to i_hi packed 1 bit each, rows padded to whole bytes as in PBM"""
+        from .writers import pack_bits
+        return pack_bits(self.to_bytes(i_lo, i_hi), self.width)
+
+    def display(self, mode="default", stream=None) -> True:
+        """Display current buffered data, encoded in one pass and written in a single call"""
+        from .writers import TEXT_GLYPHS, encode_text
+        if mode not in TEXT_GLYPHS: 
             print(f"Unspecified mode {mode}")
-            return False
\ No newline at end of file
+            return False
+        stream = sys.stdout if stream is None else stream
+        stream.write(encode_text(self, mode=mode))
+        stream.flush()
+        return True
\ No newline at end of file
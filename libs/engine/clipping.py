@@ -0,0 +1,27 @@
+def clip_segment(ax: float, ay: float, bx: float, by: float, rect: tuple): 
+    """
+    Liang-Barsky clipping of segment ab to rect (x min, x max, y min, y max). 
+    Get the endpoints of the part inside, or None when the segment misses the rect. 
+    """
+    x_min, x_max, y_min, y_max = rect
+    dx, dy = bx - ax, by - ay
+    t_lo, t_hi = 0., 1.
+    for p, q in ((-dx, ax - x_min), (dx, x_max - ax), (-dy, ay - y_min), (dy, y_max - ay)): 
+        if p == 0: 
+            # parallel to this boundary, and outside of it
+            if q < 0: 
+                return None
+            continue
+        t = q / p
+        if p < 0: 
+            if t > t_hi: 
+                return None
+            t_lo = max(t_lo, t)
+        else: 
+            if t < t_lo: 
+                return None
+            t_hi = min(t_hi, t)
+    return ax + t_lo * dx, ay + t_lo * dy, ax + t_hi * dx, ay + t_hi * dy
+
+def inside(x: float, y: float, rect: tuple) -> bool: 
+    return rect[0] <= x <= rect[1] and rect[2] <= y <= rect[3]
@@ -0,0 +1,87 @@
+from .buffer import Buffer
+from ..ops import Vector
+
+def coverage(distance: float, threshold: float=0.5) -> int: 
+    """
+    8-bit coverage of a pixel at a distance from a segment stroked threshold wide on each side: 
+    a unit pixel box against the stroke edge, full within threshold - 0.5, none past threshold + 0.5. 
+    """
+    covered = threshold + 0.5 - distance
+    if covered >= 1: 
+        return 255
+    if covered <= 0: 
+        return 0
+    return int(covered * 255 + 0.5)
+
+
+class CoverageBuffer(Buffer): 
+    """
+    Grayscale buffer, each pixel holds the 0-255 coverage of the nearest stroke. 
+    Coverage comes from the same point-to-segment distance as the binary test, in one pass 
+    at native resolution, and overlapping segments are composited with max. 
+    """
+    max_value = 255
+
+    def reach(self, threshold: float=0.5) -> float: 
+        return threshold + 0.5
+
+    def draw_segment(self, ax: float, ay: float, bx: float, by: float, threshold: float=0.5, region: tuple=None) -> None:
+        window = self.segment_window(ax, ay, bx, by, self.reach(threshold), region)
+        if window is None: 
+            return
+        i_lo, i_hi, j_lo, j_hi = window
+        distance = Buffer.point_to_segment_distance
+        for i in range(i_lo, i_hi + 1):
+            row, px = self.data[i], self.height - i
+            for j in range(j_lo, j_hi + 1):
+                value = coverage(distance(px, j, ax, ay, bx, by), threshold)
+                if value > row[j]:
+                    row[j] = value
+
+    def draw_segments(self, segments: list, threshold: float=0.5, region: tuple=None) -> None:
+        reach = self.reach(threshold)
+        rows = [[] for _ in range(self.height)]
+        for ax, ay, bx, by in segments:
+            window = self.segment_window(ax, ay, bx, by, reach, region)
+            if window is None:
+                continue
+            i_lo, i_hi, j_lo, j_hi = window
+            entry = (j_lo, j_hi, ax, ay, bx, by)
+            for i in range(i_lo, i_hi + 1):
+                rows[i].append(entry)
+        distance = Buffer.point_to_segment_distance
+        for i, active in enumerate(rows):
+            if not active:
+                continue
+            row, px = self.data[i], self.height - i
+            for j_lo, j_hi, ax, ay, bx, by in active:
+                for j in range(j_lo, j_hi + 1):
+                    # fully covered pixels cannot get darker
+                    if row[j] < 255:
+                        value = coverage(distance(px, j, ax, ay, bx, by), threshold)
+                        if value > row[j]:
+                            row[j] = value
+
+    def merge_mask(self, mask) -> None: 
+        # mask bytes are coverage values, composited with max
+        mask = bytes(mask)
+        for i in range(self.height): 
+            row_mask = mask[i * self.width:(i + 1) * self.width]
+            if row_mask.count(0) == self.width: 
+                continue
+            row = self.data[i]
+            for j, value in enumerate(row_mask): 
+                if value > row[j]: 
+                    row[j] = value
+
+    def draw_line(self, p_a: Vector, p_b: Vector, threshold: float=0.5, rasterizer: str=None) -> None:
+        rasterizer = self.rasterizer if rasterizer is None else rasterizer
+        if rasterizer == "exact": 
+            for i in range(self.height):
+                row = self.data[i]
+                for j in range(self.width):
+                    value = coverage(Buffer.point_to_line_distance(p=Vector(elements=[self.height - i, j]), a=p_a, b=p_b), threshold)
+                    if value > row[j]:
+                        row[j] = value
+        else: 
+            super().draw_line(p_a, p_b, threshold, rasterizer)
@@ -0,0 +1,152 @@
+import sys
+import queue
+import threading
+import traceback
+from collections import Counter
+
+class ErrorContext: 
+    """
+    Traceback of a reported error, captured cheaply and formatted only when it is read. 
+    Passed as traceback_details to on_error(exception, traceback_details) callbacks, 
+    str() gives the same text as traceback.format_exc() at the capture point. 
+    """
+    __slots__ = ("line", "code", "error", "text")
+
+    def __init__(self, line: int=None, code: str="error", error: BaseException=None) -> None:
+        self.line = line
+        self.code = code
+        self.error = error
+        self.text = None
+
+    @staticmethod
+    def capture(line: int=None, code: str="error"): 
+        """Capture the exception being handled"""
+        return ErrorContext(line=line, code=code, error=sys.exc_info()[1])
+
+    def __str__(self) -> str: 
+        if self.text is None: 
+            self.text = "" if self.error is None else "".join(traceback.format_exception(type(self.error), self.error, self.error.__traceback__))
+            # the frames are no longer needed
+            self.error = None
+        return self.text
+
+
+class Diagnostic: 
+    """Typed record of one script error"""
+    __slots__ = ("line", "code", "message", "context")
+
+    def __init__(self, line: int, code: str, message: str, context=None) -> None:
+        self.line = line
+        self.code = code
+        self.message = message
+        self.context = context
+
+    def traceback(self) -> str: 
+        return "" if self.context is None else str(self.context)
+
+    def format(self, with_traceback: bool=False) -> str: 
+        location = "-" if self.line is None else str(self.line)
+        text = f"line {location} [{self.code}] {self.message}\n"
+        return text + self.traceback() if with_traceback else text
+
+
+class LogWriter: 
+    """
+    Log file kept open and written in batches of lines. 
+    In background mode a thread does the writing, the callers only queue lines. 
+    """
+    def __init__(self, filename: str, batch_size: int=256, background: bool=False) -> None:
+        if not isinstance(batch_size, int) or batch_size <= 0: 
+            raise ValueError(f"Batch size should be an integer greater than zero, got {batch_size}. ")
+        # "-" writes to stderr
+        self.file = sys.stderr if filename == "-" else open(filename, 'a')
+        self.batch_size = batch_size
+        self.pending = []
+        self.queue = None
+        self.thread = None
+        if background: 
+            self.queue = queue.SimpleQueue()
+            self.thread = threading.Thread(target=self.drain, daemon=True)
+            self.thread.start()
+
+    def write(self, text: str) -> None: 
+        if self.queue is not None: 
+            self.queue.put(text)
+            return
+        self.pending.append(text)
+        if len(self.pending) >= self.batch_size: 
+            self.flush()
+
+    def flush(self) -> None: 
+        if self.pending: 
+            self.file.write("".join(self.pending))
+            self.file.flush()
+            self.pending = []
+
+    def drain(self) -> None: 
+        # background thread: batch whatever is queued, None ends it
+        while True: 
+            text = self.queue.get()
+            while text is not None: 
+                self.pending.append(text)
+                if len(self.pending) >= self.batch_size or self.queue.empty(): 
+                    break
+                text = self.queue.get()
+            self.flush()
+            if text is None: 
+                return
+
+    def close(self) -> None: 
+        if self.thread is not None: 
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self.flush()
+        if self.file is not sys.stderr: 
+            self.file.close()
+
+
+class Diagnostics: 
+    """
+    Bounded collector of script errors, usable as an on_error(exception, traceback_details) logger. 
+    The first max_errors errors are kept as Diagnostic records and written to the log writer, 
+    later ones are only counted by code. Tracebacks are formatted only when written with_traceback. 
+    """
+    def __init__(self, max_errors: int=100, writer: LogWriter=None, with_traceback: bool=False) -> None:
+        if not isinstance(max_errors, int) or max_errors < 0: 
+            raise ValueError(f"Error cap should be a non-negative integer, got {max_errors}. ")
+        self.max_errors = max_errors
+        self.writer = writer
+        self.with_traceback = with_traceback
+        self.records = []
+        self.counts = Counter()     # code -> errors reported
+        self.overflow = Counter()   # code -> errors beyond the cap
+
+    def __call__(self, exception: str, traceback_details) -> None: 
+        line = getattr(traceback_details, "line", None)
+        code = getattr(traceback_details, "code", "error")
+        self.counts[code] += 1
+        if len(self.records) >= self.max_errors: 
+            self.overflow[code] += 1
+            return
+        record = Diagnostic(line, code, exception, traceback_details)
+        self.records.append(record)
+        if self.writer is not None: 
+            self.writer.write(record.format(self.with_traceback))
+
+    def __len__(self) -> int: 
+        return sum(self.counts.values())
+
+    def summary(self) -> str: 
+        if not self.counts: 
+            return "No script errors\n"
+        by_code = ", ".join(f"{code}: {count}" for code, count in self.counts.most_common())
+        text = f"{len(self)} script errors ({by_code})\n"
+        if self.overflow: 
+            text += f"{sum(self.overflow.values())} not logged past the cap of {self.max_errors}\n"
+        return text
+
+    def close(self) -> None: 
+        if self.writer is not None: 
+            self.writer.write(self.summary())
+            self.writer.close()
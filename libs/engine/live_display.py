@@ -0,0 +1,81 @@
+import sys
+import time
+import shutil
+
+from .writers import text_glyphs, split_rows
+
+class LiveDisplay:
+    """
+    Terminal view of successive frames. It remembers the last frame written and sends only 
+    the runs of changed cells, placed with ANSI cursor moves, in a single write per frame. 
+    Frames are paced to at most fps, and a resized terminal gets a full repaint. 
+    """
+    # unchanged cells between two changed runs which are rewritten rather than jumped over, 
+    # a cursor move costs about as many bytes
+    GAP = 3
+
+    def __init__(self, stream=None, mode: str="square", fps: float=30., terminal_size=shutil.get_terminal_size) -> None:
+        if fps <= 0: 
+            raise ValueError(f"Frame rate should be greater than zero, got {fps}. ")
+        self.stream = sys.stdout if stream is None else stream
+        self.mode = mode
+        self.interval = 1 / fps
+        self.terminal_size = terminal_size
+        self.previous = None    # rows of pixel bytes of the last frame
+        self.size = None        # terminal size when it was written
+        self.last_time = None
+        self.frames, self.repaints, self.bytes_written = 0, 0, 0
+
+    def repaint(self, rows: list[bytes], glyphs) -> str: 
+        # clear the screen and write every row from the top left corner
+        return "\x1b[?25l\x1b[H\x1b[2J" + "".join(
+            f"\x1b[{i + 1};1H" + " ".join(map(glyphs, row)) for i, row in enumerate(rows)
+        )
+
+    def changes(self, rows: list[bytes], glyphs) -> str: 
+        parts = []
+        for i, (row, previous) in enumerate(zip(rows, self.previous)): 
+            if row == previous: 
+                continue
+            changed = [j for j in range(len(row)) if row[j] != previous[j]]
+            # group the changed cells in runs, bridging short gaps
+            start = end = changed[0]
+            for j in changed[1:] + [None]: 
+                if j is not None and j - end <= LiveDisplay.GAP + 1: 
+                    end = j
+                    continue
+                # each cell takes a glyph and a space, so cell j starts at column 2j + 1
+                parts.append(f"\x1b[{i + 1};{2 * start + 1}H" + " ".join(map(glyphs, row[start:end + 1])))
+                if j is not None: 
+                    start = end = j
+        return "".join(parts)
+
+    def show(self, buffer) -> int: 
+        """Write a frame, waiting for its slot under the frame rate cap, and get the number of characters sent"""
+        now = time.perf_counter()
+        if self.last_time is not None and now - self.last_time < self.interval: 
+            time.sleep(self.interval - (now - self.last_time))
+        self.last_time = time.perf_counter()
+
+        glyphs = text_glyphs(buffer, self.mode)
+        rows = split_rows(buffer.to_bytes(), buffer.width) if buffer.width else [b''] * buffer.height
+        size = tuple(self.terminal_size())
+        if self.previous is None or size != self.size or len(rows) != len(self.previous) or \
+                (rows and len(rows[0]) != len(self.previous[0])): 
+            text = self.repaint(rows, glyphs)
+            self.repaints += 1
+        else: 
+            text = self.changes(rows, glyphs)
+        # park the cursor below the canvas
+        text += f"\x1b[{len(rows) + 1};1H"
+        self.stream.write(text)
+        self.stream.flush()
+        self.previous, self.size = rows, size
+        self.frames += 1
+        self.bytes_written += len(text)
+        return len(text)
+
+    def close(self) -> None: 
+        """Show the cursor again"""
+        self.stream.write("\x1b[?25h")
+        self.stream.flush()
@@ -0,0 +1,81 @@
+try: 
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError: 
+    np = None
+    HAS_NUMPY = False
+
+from .buffer import Buffer
+from ..ops import Vector
+
+class NumpyBuffer(Buffer):
+    """Buffer storing pixels in a numpy uint8 array and rasterizing a whole window per expression"""
+    def __init__(self, height: int, width: int, rasterizer: str="bbox") -> None:
+        if not HAS_NUMPY: 
+            raise ImportError("NumpyBuffer requires numpy, use the python backend instead. ")
+        super().__init__(height=height, width=width, rasterizer=rasterizer)
+
+    def new_storage(self, height: int, width: int): 
+        return np.zeros((height, width), dtype=np.uint8)
+
+    @staticmethod
+    def distance_field(px, py, ax: float, ay: float, bx: float, by: float):
+        """
+        Vectorized point_to_line_distance over arrays of pixel coordinates. 
+        Same clamped projection and operation order as Buffer.point_to_segment_distance. 
+        """
+        dx, dy = bx - ax, by - ay
+        length = (dx ** 2 + dy ** 2) ** .5
+        if length == 0: 
+            return ((ax - px) ** 2 + (ay - py) ** 2) ** .5
+        t = ((ax - px) * (ax - bx) + (ay - py) * (ay - by)) / length ** 2
+        t_prime = np.clip(t, 0, 1)
+        qx, qy = ax + t_prime * dx, ay + t_prime * dy
+        return ((px - qx) ** 2 + (py - qy) ** 2) ** .5
+
+    def draw_window(self, ax: float, ay: float, bx: float, by: float, threshold: float, window: tuple) -> None: 
+        """Rasterize segment ab over the pixel window (first row, last row, first col, last col)"""
+        i_lo, i_hi, j_lo, j_hi = window
+        px = (self.height - np.arange(i_lo, i_hi + 1, dtype=np.float64))[:, None]
+        py = np.arange(j_lo, j_hi + 1, dtype=np.float64)[None, :]
+        mask = NumpyBuffer.distance_field(px, py, ax, ay, bx, by) <= threshold
+        self.data[i_lo:i_hi + 1, j_lo:j_hi + 1] |= mask.astype(np.uint8)
+
+    def fill_span(self, i: int, j_lo: int, j_hi: int) -> None: 
+        self.data[i, j_lo:j_hi + 1] = self.max_value
+
+    def copy_storage(self): 
+        return self.data.copy()
+
+    def clear(self, region: tuple=None) -> None: 
+        if region is None: 
+            self.data[:] = 0
+            return
+        i_lo, i_hi, j_lo, j_hi = region
+        self.data[i_lo:i_hi + 1, j_lo:j_hi + 1] = 0
+
+    def draw_segment(self, ax: float, ay: float, bx: float, by: float, threshold: float=0.5, region: tuple=None) -> None:
+        window = self.segment_window(ax, ay, bx, by, threshold, region)
+        if window is None: 
+            return
+        self.draw_window(ax, ay, bx, by, threshold, window)
+
+    def draw_segments(self, segments: list, threshold: float=0.5, region: tuple=None) -> None:
+        # each window is already a single vectorized pass
+        for ax, ay, bx, by in segments:
+            self.draw_segment(ax, ay, bx, by, threshold, region)
+
+    def to_bytes(self, i_lo: int=0, i_hi: int=None) -> bytes: 
+        i_hi = self.height - 1 if i_hi is None else i_hi
+        return self.data[i_lo:i_hi + 1].tobytes()
+
+    def merge_mask(self, mask) -> None: 
+        self.data |= (np.frombuffer(mask, dtype=np.uint8, count=self.height * self.width).reshape(self.height, self.width) != 0)
+
+    def draw_line(self, p_a: Vector, p_b: Vector, threshold: float=0.5, rasterizer: str=None) -> None:
+        rasterizer = self.rasterizer if rasterizer is None else rasterizer
+        if rasterizer == "exact": 
+            if self.height and self.width: 
+                self.draw_window(p_a[0], p_a[1], p_b[0], p_b[1], threshold, (0, self.height - 1, 0, self.width - 1))
+        else: 
+            super().draw_line(p_a, p_b, threshold, rasterizer)
\ No newline at end of file
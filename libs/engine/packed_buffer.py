@@ -0,0 +1,237 @@
+import mmap
+from array import array
+
+from .buffer import Buffer
+from .writers import PBM_BITS
+
+# binary digit to pixel value
+DIGIT_PIXELS = bytes(1 if value == ord('1') else 0 for value in range(256))
+
+class PackedRow: 
+    """View of one row of a packed buffer, indexed by column like a list of 0/1 pixels"""
+    __slots__ = ("bits", "offset", "width")
+
+    def __init__(self, bits, offset: int, width: int) -> None:
+        self.bits = bits
+        self.offset = offset
+        self.width = width
+
+    def __len__(self) -> int: 
+        return self.width
+
+    def __getitem__(self, j): 
+        if isinstance(j, slice): 
+            return [self[k] for k in range(*j.indices(self.width))]
+        if j < 0: 
+            j += self.width
+        if not 0 <= j < self.width: 
+            raise IndexError(f"Column {j} out of range for width {self.width}. ")
+        return (self.bits[self.offset + (j >> 3)] >> (7 - (j & 7))) & 1
+
+    def __setitem__(self, j, value) -> None: 
+        if isinstance(j, slice): 
+            for k, item in zip(range(*j.indices(self.width)), value): 
+                self[k] = item
+            return
+        if j < 0: 
+            j += self.width
+        if not 0 <= j < self.width: 
+            raise IndexError(f"Column {j} out of range for width {self.width}. ")
+        index, mask = self.offset + (j >> 3), 0x80 >> (j & 7)
+        if value: 
+            self.bits[index] |= mask
+        else: 
+            self.bits[index] &= ~mask & 0xFF
+
+    def __iter__(self): 
+        return iter(self[0:self.width])
+
+
+class PackedRows: 
+    """Rows of 1-bit pixels packed 8 per byte, most significant bit first, each row padded to whole bytes"""
+    __slots__ = ("bits", "height", "width", "stride")
+
+    def __init__(self, bits, height: int, width: int) -> None:
+        self.bits = bits
+        self.height = height
+        self.width = width
+        self.stride = (width + 7) // 8
+
+    def __len__(self) -> int: 
+        return self.height
+
+    def __getitem__(self, i) -> PackedRow: 
+        if i < 0: 
+            i += self.height
+        if not 0 <= i < self.height: 
+            raise IndexError(f"Row {i} out of range for height {self.height}. ")
+        return PackedRow(self.bits, i * self.stride, self.width)
+
+    def __iter__(self): 
+        return (self[i] for i in range(self.height))
+
+
+class PackedBuffer(Buffer): 
+    """
+    Buffer storing each pixel as one bit of a bytearray, 64 times less than a list of rows. 
+    Given a filename, the bits live in a memory-mapped file instead, and the canvas may exceed memory: 
+    render() then rasterizes strip by strip and flushes every strip to the file. 
+    """
+    # rows rasterized per strip by render()
+    STRIP_ROWS = 1024
+
+    def __init__(self, height: int, width: int, rasterizer: str="bbox", filename: str=None) -> None:
+        self.filename = filename
+        self.file = None
+        super().__init__(height=height, width=width, rasterizer=rasterizer)
+
+    def new_storage(self, height: int, width: int) -> PackedRows: 
+        size = height * ((width + 7) // 8)
+        if self.filename is None or size == 0: 
+            return PackedRows(bytearray(size), height, width)
+        # a new file is zero-filled by truncate, without writing it
+        self.file = open(self.filename, 'w+b')
+        self.file.truncate(size)
+        return PackedRows(mmap.mmap(self.file.fileno(), size), height, width)
+
+    def close(self) -> None: 
+        """Flush and release a memory-mapped canvas"""
+        if self.file is None: 
+            return
+        self.data.bits.flush()
+        self.data.bits.close()
+        self.file.close()
+        self.file = None
+
+    def copy_storage(self) -> PackedRows: 
+        # copies are held in memory
+        return PackedRows(bytearray(self.data.bits), self.height, self.width)
+
+    def copy(self): 
+        result = super().copy()
+        result.filename, result.file = None, None
+        return result
+
+    def clear(self, region: tuple=None) -> None: 
+        bits, stride = self.data.bits, self.data.stride
+        if region is None: 
+            for start in range(0, len(bits), 1 << 20): 
+                end = min(len(bits), start + (1 << 20))
+                bits[start:end] = bytes(end - start)
+            return
+        i_lo, i_hi, j_lo, j_hi = region
+        for i in range(i_lo, i_hi + 1): 
+            offset = i * stride
+            for j in range(j_lo, j_hi + 1): 
+                bits[offset + (j >> 3)] &= ~(0x80 >> (j & 7)) & 0xFF
+
+    def fill_span(self, i: int, j_lo: int, j_hi: int) -> None:
+        bits, offset = self.data.bits, i * self.data.stride
+        first, last = offset + (j_lo >> 3), offset + (j_hi >> 3)
+        head, tail = 0xFF >> (j_lo & 7), (0xFF << (7 - (j_hi & 7))) & 0xFF
+        if first == last: 
+            bits[first] |= head & tail
+            return
+        # partial bytes at both ends, whole bytes in between
+        bits[first] |= head
+        bits[first + 1:last] = b'\xff' * (last - first - 1)
+        bits[last] |= tail
+
+    def draw_segment(self, ax: float, ay: float, bx: float, by: float, threshold: float=0.5, region: tuple=None) -> None:
+        window = self.segment_window(ax, ay, bx, by, threshold, region)
+        if window is None: 
+            return
+        i_lo, i_hi, j_lo, j_hi = window
+        bits, stride = self.data.bits, self.data.stride
+        distance = Buffer.point_to_segment_distance
+        for i in range(i_lo, i_hi + 1):
+            offset, px = i * stride, self.height - i
+            for j in range(j_lo, j_hi + 1):
+                if distance(px, j, ax, ay, bx, by) <= threshold:
+                    bits[offset + (j >> 3)] |= 0x80 >> (j & 7)
+
+    def draw_segments(self, segments: list, threshold: float=0.5, region: tuple=None) -> None:
+        # same row binning as Buffer.draw_segments, restricted to the rows of the region
+        i_first, i_last = (0, self.height - 1) if region is None else (region[0], region[1])
+        entries = []
+        for ax, ay, bx, by in segments:
+            window = self.segment_window(ax, ay, bx, by, threshold, region)
+            if window is not None:
+                entries.append((*window, ax, ay, bx, by))
+        self.draw_entries(entries, threshold, i_first, i_last)
+
+    def draw_entries(self, entries, threshold: float, i_first: int, i_last: int) -> None:
+        """Rasterize (i_lo, i_hi, j_lo, j_hi, ax, ay, bx, by) windowed segments over rows i_first to i_last"""
+        rows = [[] for _ in range(max(0, i_last - i_first + 1))]
+        for i_lo, i_hi, j_lo, j_hi, ax, ay, bx, by in entries:
+            entry = (j_lo, j_hi, ax, ay, bx, by)
+            for i in range(max(i_lo, i_first), min(i_hi, i_last) + 1):
+                rows[i - i_first].append(entry)
+        bits, stride = self.data.bits, self.data.stride
+        distance = Buffer.point_to_segment_distance
+        for i, active in enumerate(rows, start=i_first):
+            if not active:
+                continue
+            offset, px = i * stride, self.height - i
+            for j_lo, j_hi, ax, ay, bx, by in active:
+                for j in range(j_lo, j_hi + 1):
+                    index, mask = offset + (j >> 3), 0x80 >> (j & 7)
+                    if not bits[index] & mask and distance(px, j, ax, ay, bx, by) <= threshold:
+                        bits[index] |= mask
+
+    def render(self, shapes, threshold: float=0.5, chunk_size: int=1 << 16) -> None:
+        if self.rasterizer == "exact" or self.file is None: 
+            super().render(shapes, threshold, chunk_size)
+            return
+        # packed tables of the segments and their pixel windows, each window computed once, 
+        # and per strip the indices of the segments it touches
+        table, windows = array('d'), array('l')
+        strips = [array('L') for _ in range(0, self.height, PackedBuffer.STRIP_ROWS)]
+        for shape in shapes: 
+            shape_segments = shape.segments()
+            if not self.visible(shape_segments, threshold): 
+                continue
+            for segment in shape_segments: 
+                window = self.segment_window(*segment, threshold)
+                if window is None: 
+                    continue
+                index = len(windows) // 4
+                for strip in range(window[0] // PackedBuffer.STRIP_ROWS, window[1] // PackedBuffer.STRIP_ROWS + 1): 
+                    strips[strip].append(index)
+                table.extend(segment)
+                windows.extend(window)
+            if shape.fill is not None: 
+                self.fill_polygon(shape.outline(), shape.fill)
+        for strip, indices in enumerate(strips): 
+            i_lo = strip * PackedBuffer.STRIP_ROWS
+            i_hi = min(self.height, i_lo + PackedBuffer.STRIP_ROWS) - 1
+            entries = (tuple(windows[4 * k:4 * k + 4]) + tuple(table[4 * k:4 * k + 4]) for k in indices)
+            self.draw_entries(entries, threshold, i_lo, i_hi)
+            # written back, so the pages of finished strips can be dropped
+            self.data.bits.flush()
+
+    def merge_mask(self, mask) -> None: 
+        mask = bytes(mask)
+        bits, stride = self.data.bits, self.data.stride
+        padding = b'0' * (stride * 8 - self.width)
+        for i in range(self.height): 
+            row_mask = mask[i * self.width:(i + 1) * self.width]
+            if row_mask.count(0) == self.width: 
+                continue
+            packed = int(row_mask.translate(PBM_BITS) + padding, 2).to_bytes(stride, 'big')
+            offset = i * stride
+            bits[offset:offset + stride] = bytes(a | b for a, b in zip(bits[offset:offset + stride], packed))
+
+    def to_bits(self, i_lo: int=0, i_hi: int=None) -> bytes: 
+        i_hi = self.height - 1 if i_hi is None else i_hi
+        return bytes(self.data.bits[i_lo * self.data.stride:(i_hi + 1) * self.data.stride])
+
+    def to_bytes(self, i_lo: int=0, i_hi: int=None) -> bytes: 
+        # unpacked one row at a time through its binary digits
+        bits, stride = self.data.bits, self.data.stride
+        i_hi = self.height - 1 if i_hi is None else i_hi
+        rows = []
+        for i in range(i_lo, i_hi + 1): 
+            number = int.from_bytes(bits[i * stride:(i + 1) * stride], 'big')
+            rows.append(format(number, f'0{stride * 8}b')[:self.width].encode().translate(DIGIT_PIXELS))
+        return b''.join(rows)
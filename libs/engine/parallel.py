@@ -0,0 +1,100 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .buffer import Buffer
+from .coverage_buffer import coverage
+from .numpy_buffer import NumpyBuffer
+
+def render_band(shm_name: str, width: int, entries: list, threshold: float, height: int, anti_alias: bool=False) -> int: 
+    """
+    Worker: rasterize the (i_lo, i_hi, j_lo, j_hi, ax, ay, bx, by) entries of one row band 
+    straight into the shared framebuffer, one byte per pixel, holding coverage when anti-aliasing. 
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try: 
+        pixels = shm.buf
+        distance = Buffer.point_to_segment_distance
+        count = 0
+        for i_lo, i_hi, j_lo, j_hi, ax, ay, bx, by in entries: 
+            for i in range(i_lo, i_hi + 1): 
+                offset, px = i * width, height - i
+                for j in range(j_lo, j_hi + 1): 
+                    if anti_alias: 
+                        value = coverage(distance(px, j, ax, ay, bx, by), threshold)
+                        if value > pixels[offset + j]: 
+                            count += not pixels[offset + j]
+                            pixels[offset + j] = value
+                    elif not pixels[offset + j] and distance(px, j, ax, ay, bx, by) <= threshold: 
+                        pixels[offset + j] = 1
+                        count += 1
+        del pixels
+        return count
+    finally: 
+        shm.close()
+
+
+class ParallelRenderer: 
+    """Render a scene in row bands on a process pool, sharing one framebuffer with the workers"""
+    def __init__(self, workers: int, bands_per_worker: int=4) -> None:
+        if not isinstance(workers, int) or workers <= 0: 
+            raise ValueError(f"Number of workers should be an integer greater than zero, got {workers}. ")
+        self.workers = workers
+        self.bands_per_worker = bands_per_worker
+        # hot-path counters of the last render, merged from the workers, the profiler cannot see into them
+        self.counts = Counter()
+
+    def bands(self, height: int) -> list[tuple[int, int]]: 
+        """Split the rows into (first row, last row) bands"""
+        num_bands = max(1, min(height, self.workers * self.bands_per_worker))
+        step = -(-height // num_bands)
+        return [(start, min(height, start + step) - 1) for start in range(0, height, step)]
+
+    def render(self, buffer: Buffer, shapes, threshold: float=0.5) -> None: 
+        """Rasterize all shapes into buffer, with the same pixels as Buffer.render"""
+        self.counts = Counter()
+        if isinstance(buffer, NumpyBuffer): 
+            # a vectorized window costs less than shipping it to a worker, the serial render is faster
+            buffer.render(shapes, threshold)
+            return
+        if buffer.height == 0 or buffer.width == 0: 
+            return
+        bands = self.bands(buffer.height)
+        step = bands[0][1] - bands[0][0] + 1
+        # bin the segment windows into the bands they cover
+        binned = [[] for _ in bands]
+        # fills are cheap scanline passes, done here once the bands are merged
+        fills = []
+        for shape in shapes: 
+            segments = shape.segments()
+            if not buffer.visible(segments, threshold): 
+                continue
+            if shape.fill is not None: 
+                fills.append((shape.outline(), shape.fill))
+            self.counts["segments drawn"] += len(segments)
+            for ax, ay, bx, by in segments: 
+                window = buffer.segment_window(ax, ay, bx, by, buffer.reach(threshold))
+                if window is None: 
+                    continue
+                i_lo, i_hi, j_lo, j_hi = window
+                self.counts["pixels tested"] += (i_hi - i_lo + 1) * (j_hi - j_lo + 1)
+                for k in range(i_lo // step, i_hi // step + 1): 
+                    band_lo, band_hi = bands[k]
+                    binned[k].append((max(i_lo, band_lo), min(i_hi, band_hi), j_lo, j_hi, ax, ay, bx, by))
+
+        shm = shared_memory.SharedMemory(create=True, size=buffer.height * buffer.width)
+        try: 
+            shm.buf[:] = bytes(buffer.height * buffer.width)
+            with ProcessPoolExecutor(max_workers=self.workers) as pool: 
+                futures = [
+                    pool.submit(render_band, shm.name, buffer.width, entries, threshold, buffer.height, buffer.max_value > 1) 
+                    for entries in binned if entries
+                ]
+                for future in futures: 
+                    self.counts["pixels set"] += future.result()
+            buffer.merge_mask(shm.buf)
+            for outline, rule in fills: 
+                buffer.fill_polygon(outline, rule)
+        finally: 
+            shm.close()
+            shm.unlink()
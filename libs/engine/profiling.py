@@ -0,0 +1,252 @@
+import io
+import sys
+import json
+import time
+import cProfile
+import pstats
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+from .buffer import Buffer
+from ..ops import Vector, Vec2, Vec3
+from ..shapes import Shape
+
+class Profiler:
+    """
+    Opt-in instrumentation: per-stage wall/CPU timers and hot-path counters. 
+    Counters work by wrapping methods in install() and restoring them in uninstall(), 
+    so the engine carries no instrumentation code and a disabled profiler costs nothing. 
+    """
+    def __init__(self, enabled: bool=True) -> None:
+        self.enabled = enabled
+        self.stages = {}    # stage name -> {"wall": seconds, "cpu": seconds}
+        self.counters = Counter()
+        self.originals = []  # (owner, attribute name, original) for uninstall
+        self.nested = False  # set while a wrapper runs, so inner calls are not counted twice
+        self.inner = []  # [wall, cpu] of the stages nested in each open stage, not counted in its own time
+
+    @contextmanager
+    def stage(self, name: str): 
+        """Time a stage of the run, repeated stages accumulate and nested stages are left out"""
+        if not self.enabled: 
+            yield
+            return
+        self.inner.append([0., 0.])
+        wall, cpu = time.perf_counter(), time.process_time()
+        try: 
+            yield
+        finally: 
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            inner_wall, inner_cpu = self.inner.pop()
+            timing = self.stages.setdefault(name, {"wall": 0., "cpu": 0.})
+            timing["wall"] += wall - inner_wall
+            timing["cpu"] += cpu - inner_cpu
+            if self.inner: 
+                self.inner[-1][0] += wall
+                self.inner[-1][1] += cpu
+
+    def staged(self, name: str, iterable): 
+        """Iterate over iterable as it is, timing the production of each item as a stage"""
+        iterator, done = iter(iterable), object()
+        while True: 
+            with self.stage(name): 
+                item = next(iterator, done)
+            if item is done: 
+                return
+            yield item
+
+    @staticmethod
+    def count_set(buffer: Buffer, spans: list=None) -> int: 
+        """Number of set pixels of buffer, or of its (i, j_lo, j_hi) row spans"""
+        if spans is None: 
+            pixels = buffer.to_bytes()
+            return len(pixels) - pixels.count(0)
+        count = 0
+        for i, j_lo, j_hi in spans: 
+            pixels = bytes(buffer.data[i][j_lo:j_hi + 1])
+            count += len(pixels) - pixels.count(0)
+        return count
+
+    @staticmethod
+    def spans(windows) -> list: 
+        """Row spans covering the (i_lo, i_hi, j_lo, j_hi) pixel windows, one (i, j_lo, j_hi) per row"""
+        rows = {}
+        for i_lo, i_hi, j_lo, j_hi in windows: 
+            for i in range(i_lo, i_hi + 1): 
+                lo, hi = rows.get(i, (j_lo, j_hi))
+                rows[i] = (min(lo, j_lo), max(hi, j_hi))
+        return [(i, j_lo, j_hi) for i, (j_lo, j_hi) in rows.items()]
+
+    @staticmethod
+    def subclasses(root: type) -> list: 
+        """root and all its subclasses, however deep"""
+        owners, pending = [], [root]
+        while pending: 
+            owner = pending.pop()
+            owners.append(owner)
+            pending.extend(owner.__subclasses__())
+        return owners
+
+    def patch(self, owner, name: str, wrapper) -> None: 
+        self.originals.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, wrapper)
+
+    def install(self) -> None: 
+        """Wrap the hot paths with counters"""
+        if not self.enabled or self.originals: 
+            return
+        # every backend has to be imported, so that it is found among the subclasses
+        from . import numpy_buffer, packed_buffer, coverage_buffer
+        counters = self.counters
+
+        def window_of(buffer, segment, threshold, region): 
+            # the buffer's own clip counts must not see the windows computed for counting
+            clip_counts = buffer.clip_counts.copy()
+            window = buffer.segment_window(*segment, buffer.reach(threshold), region)
+            buffer.clip_counts = clip_counts
+            return window
+
+        # pixels set are counted in the pixel windows a call can reach, never in the whole buffer
+        def counted_segment(original): 
+            def draw_segment(buffer, ax, ay, bx, by, threshold=0.5, region=None): 
+                window = window_of(buffer, (ax, ay, bx, by), threshold, region)
+                spans = Profiler.spans([window] if window is not None else [])
+                before = Profiler.count_set(buffer, spans)
+                if window is not None: 
+                    counters["pixels tested"] += (window[1] - window[0] + 1) * (window[3] - window[2] + 1)
+                original(buffer, ax, ay, bx, by, threshold, region)
+                counters["segments drawn"] += 1
+                counters["pixels set"] += Profiler.count_set(buffer, spans) - before
+            return draw_segment
+
+        def counted_segments(original): 
+            def draw_segments(buffer, segments, threshold=0.5, region=None): 
+                segments = list(segments)
+                windows = [window for window in (window_of(buffer, segment, threshold, region) for segment in segments) 
+                           if window is not None]
+                spans = Profiler.spans(windows)
+                before = Profiler.count_set(buffer, spans)
+                for i_lo, i_hi, j_lo, j_hi in windows: 
+                    counters["pixels tested"] += (i_hi - i_lo + 1) * (j_hi - j_lo + 1)
+                original(buffer, segments, threshold, region)
+                counters["segments drawn"] += len(segments)
+                counters["pixels set"] += Profiler.count_set(buffer, spans) - before
+            return draw_segments
+
+        def counted_entries(original): 
+            # windowed segments of one strip, each counted in the first strip it reaches, 
+            # segments without a pixel window never reach the strips and are not counted
+            def draw_entries(buffer, entries, threshold, i_first, i_last): 
+                entries = list(entries)
+                spans = Profiler.spans((max(i_lo, i_first), min(i_hi, i_last), j_lo, j_hi) for i_lo, i_hi, j_lo, j_hi, *_ in entries)
+                before = Profiler.count_set(buffer, spans)
+                for i_lo, i_hi, j_lo, j_hi, *_ in entries: 
+                    counters["pixels tested"] += (min(i_hi, i_last) - max(i_lo, i_first) + 1) * (j_hi - j_lo + 1)
+                    counters["segments drawn"] += i_lo >= i_first
+                original(buffer, entries, threshold, i_first, i_last)
+                counters["pixels set"] += Profiler.count_set(buffer, spans) - before
+            return draw_entries
+
+        def guarded(wrapper, original): 
+            # nested calls made while another wrapper is counting go straight through
+            def call(*args, **kwargs): 
+                if self.nested: 
+                    return original(*args, **kwargs)
+                self.nested = True
+                try: 
+                    return wrapper(*args, **kwargs)
+                finally: 
+                    self.nested = False
+            return call
+
+        def counted_init(original): 
+            def __init__(vector, *args, **kwargs): 
+                counters["Vector allocated"] += 1
+                original(vector, *args, **kwargs)
+            return __init__
+
+        def counted_to_vector(original): 
+            def to_vector(compact): 
+                counters["Vector allocated"] += 1
+                return original(compact)
+            return to_vector
+
+        def timed_vertices(original): 
+            # shapes are transformed when their vertices are first asked for, while they are drawn
+            def vertex_array(shape): 
+                with self.stage("transform"): 
+                    return original.fget(shape)
+            return property(vertex_array)
+
+        hot_paths = (("draw_segment", counted_segment), ("draw_segments", counted_segments), ("draw_entries", counted_entries))
+        for owner in Profiler.subclasses(Buffer): 
+            for name, counted in hot_paths: 
+                if name in owner.__dict__: 
+                    original = owner.__dict__[name]
+                    self.patch(owner, name, guarded(counted(original), original))
+        for owner in Profiler.subclasses(Shape): 
+            if "vertex_array" in owner.__dict__: 
+                self.patch(owner, "vertex_array", timed_vertices(owner.__dict__["vertex_array"]))
+        self.patch(Vector, "__init__", counted_init(Vector.__init__))
+        for owner in (Vec2, Vec3): 
+            self.patch(owner, "to_vector", counted_to_vector(owner.__dict__["to_vector"]))
+
+    def uninstall(self) -> None: 
+        """Restore the original methods"""
+        for owner, name, original in reversed(self.originals): 
+            setattr(owner, name, original)
+        self.originals = []
+
+    def __enter__(self): 
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info): 
+        self.uninstall()
+
+    def summary(self) -> dict: 
+        return {"stages": self.stages, "counters": dict(self.counters)}
+
+    def report(self) -> str: 
+        lines = [f"{'stage':<12} {'wall':>10} {'cpu':>10}"]
+        for name, timing in self.stages.items(): 
+            lines.append(f"{name:<12} {timing['wall'] * 1e3:>8.2f}ms {timing['cpu'] * 1e3:>8.2f}ms")
+        for name, value in self.counters.items(): 
+            lines.append(f"{name:<18} {value:>10}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, destination: str) -> None: 
+        """Print the report to stderr for "-", otherwise write the summary as JSON"""
+        if destination == "-": 
+            sys.stderr.write(self.report())
+            return
+        with open(destination, 'w') as file_handler: 
+            json.dump(self.summary(), file_handler, indent=2)
+
+
+def run_with_hooks(func, cprofile_path: str=None, tracemalloc_top: int=0): 
+    """Run func under cProfile and/or tracemalloc, dumping their stats, and get its result"""
+    profile = cProfile.Profile() if cprofile_path else None
+    if tracemalloc_top: 
+        tracemalloc.start()
+    if profile is not None: 
+        profile.enable()
+    try: 
+        return func()
+    finally: 
+        # stop both before reporting, so the reports do not measure themselves
+        if profile is not None: 
+            profile.disable()
+        if tracemalloc_top: 
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        if profile is not None: 
+            profile.dump_stats(cprofile_path)
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats("cumulative").print_stats(15)
+            sys.stderr.write(stream.getvalue())
+        if tracemalloc_top: 
+            sys.stderr.write(f"Top {tracemalloc_top} allocation sites\n")
+            for statistic in snapshot.statistics("lineno")[:tracemalloc_top]: 
+                sys.stderr.write(f"{statistic}\n")
@@ -0,0 +1,46 @@
+from math import floor, ceil
+
+def polygon_spans(points: list, height: int, width: int, rule: str="evenodd", region: tuple=None): 
+    """
+    Active-edge-table scanline fill of the closed polygon through the (x, y) points. 
+    Yields (row, first col, last col) spans of the pixels whose centre is inside under the 
+    "evenodd" or "nonzero" rule, so the cost grows with the edges and the filled length only. 
+    """
+    i_first, i_last, j_first, j_last = (0, height - 1, 0, width - 1) if region is None else region
+    # edge table: each edge is bucketed by the first row crossing it
+    buckets = {}
+    last_row = -1
+    for k in range(len(points)): 
+        (x0, y0), (x1, y1) = points[k], points[(k + 1) % len(points)]
+        # rows are lines of constant x, so edges along a row never cross one
+        if x0 == x1: 
+            continue
+        # row i sits at x = height - i and crosses the edge when x_lo <= x < x_hi
+        x_lo, x_hi = min(x0, x1), max(x0, x1)
+        i_lo = max(i_first, floor(height - x_hi) + 1)
+        i_hi = min(i_last, floor(height - x_lo))
+        if i_lo > i_hi: 
+            continue
+        buckets.setdefault(i_lo, []).append((i_hi, x0, y0, (y1 - y0) / (x1 - x0), 1 if x1 > x0 else -1))
+        last_row = max(last_row, i_hi)
+    if not buckets: 
+        return
+
+    active = []
+    for i in range(min(buckets), last_row + 1): 
+        # add the edges starting on this row, drop those which ended
+        active = [edge for edge in active if edge[0] >= i] + buckets.get(i, [])
+        if not active: 
+            continue
+        x = height - i
+        crossings = sorted((y0 + (x - x0) * slope, direction) for _, x0, y0, slope, direction in active)
+        winding = 0
+        for (y_a, direction), (y_b, _) in zip(crossings, crossings[1:]): 
+            winding += direction
+            inside = winding % 2 if rule == "evenodd" else winding != 0
+            if not inside: 
+                continue
+            # pixel centres j with y_a <= j < y_b
+            j_lo, j_hi = max(j_first, ceil(y_a)), min(j_last, ceil(y_b) - 1)
+            if j_lo <= j_hi: 
+                yield i, j_lo, j_hi
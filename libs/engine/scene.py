@@ -0,0 +1,126 @@
+from .buffer import Buffer
+from .spatial_index import SegmentGrid
+from ..ops import Vector, Matrix, Affine2D
+
+class Scene:
+    """
+    Retained set of shapes drawn into a persistent Buffer. 
+    Changes only mark pixel windows dirty, flush() re-rasterizes just those windows. 
+    """
+    def __init__(self, height: int, width: int, threshold: float=0.5, backend: str="python", cell_size: int=16) -> None:
+        self.buffer = Buffer.create(height=height, width=width, backend=backend)
+        self.threshold = threshold
+        self.shapes = {}    # shape id -> shape
+        self.index = SegmentGrid(cell_size=cell_size)  # screen-space segments keyed by shape id
+        self.windows = {}   # shape id -> pixel window covered, or None when offscreen
+        self.dirty = []     # pixel windows waiting for flush
+        self.next_id = 0
+
+    @staticmethod
+    def from_loader(script_loader, threshold: float=0.5, backend: str="python"): 
+        """Build a scene holding the shapes of a loaded script"""
+        height, width = script_loader.get_size()
+        scene = Scene(height=height, width=width, threshold=threshold, backend=backend)
+        for shape in script_loader.get_shapes(): 
+            scene.add(shape)
+        return scene
+
+    def shape_window(self, segments: list): 
+        """Union of the pixel windows of the segments, or None"""
+        windows = [self.buffer.segment_window(*segment, self.buffer.reach(self.threshold)) for segment in segments]
+        windows = [window for window in windows if window is not None]
+        if not windows: 
+            return None
+        return (min(window[0] for window in windows), max(window[1] for window in windows), 
+                min(window[2] for window in windows), max(window[3] for window in windows))
+
+    def invalidate(self, window) -> None: 
+        if window is not None: 
+            self.dirty.append(window)
+
+    def add(self, shape) -> int: 
+        """Add a shape and get its id"""
+        shape_id = self.next_id
+        self.next_id += 1
+        self.shapes[shape_id] = shape
+        self.refresh(shape_id)
+        return shape_id
+
+    def remove(self, shape_id: int) -> None: 
+        self.invalidate(self.windows.pop(shape_id))
+        self.index.remove(shape_id)
+        del self.shapes[shape_id]
+
+    def transform(self, shape_id: int, transform_matrix: Matrix, translation_vector: Vector) -> None: 
+        """Apply an affine transformation to one shape"""
+        self.shapes[shape_id].affine_transform(transform_matrix, translation_vector)
+        self.refresh(shape_id)
+
+    def set_transform(self, shape_id: int, transform: Affine2D) -> None: 
+        """Replace the transformation of one shape"""
+        self.shapes[shape_id].transform = transform
+        self.refresh(shape_id)
+
+    def refresh(self, shape_id: int) -> None: 
+        """Recompute the geometry of a shape changed in place, invalidating its old and new area"""
+        self.invalidate(self.windows.get(shape_id))
+        segments = self.shapes[shape_id].segments()
+        self.index.insert(shape_id, segments)
+        self.windows[shape_id] = self.shape_window(segments)
+        self.invalidate(self.windows[shape_id])
+
+    @staticmethod
+    def merge_windows(windows: list) -> list: 
+        """Merge overlapping windows until they are disjoint"""
+        merged = []
+        for window in windows: 
+            # absorb every merged window overlapping the current one, then repeat on the grown window
+            while True: 
+                overlapping = [other for other in merged if Buffer.intersect_windows(window, other) is not None]
+                if not overlapping: 
+                    break
+                for other in overlapping: 
+                    merged.remove(other)
+                    window = (min(window[0], other[0]), max(window[1], other[1]), 
+                              min(window[2], other[2]), max(window[3], other[3]))
+            merged.append(window)
+        return merged
+
+    def flush(self) -> list: 
+        """Re-rasterize the dirty windows and get them"""
+        regions = Scene.merge_windows(self.dirty)
+        self.dirty = []
+        for region in regions: 
+            self.buffer.clear(region)
+            self.index.rasterize(self.buffer, self.threshold, region)
+            self.fill_region(region)
+        return regions
+
+    def fill_region(self, region: tuple=None) -> None: 
+        """Redo the fills of the filled shapes overlapping a region, or everywhere"""
+        for shape_id, shape in self.shapes.items(): 
+            window = self.windows[shape_id]
+            if shape.fill is None or window is None: 
+                continue
+            if region is None or Buffer.intersect_windows(window, region) is not None: 
+                self.buffer.fill_polygon(shape.outline(), shape.fill, region)
+
+    def render(self) -> Buffer: 
+        """Redraw the whole scene from scratch"""
+        self.dirty = []
+        self.buffer.clear()
+        self.index.rasterize(self.buffer, self.threshold)
+        self.fill_region()
+        return self.buffer
+
+    def pick(self, i: int, j: int, threshold: float=None) -> list[int]: 
+        """Get the ids of the shapes with an edge within threshold of pixel (i, j), nearest first"""
+        threshold = self.threshold if threshold is None else threshold
+        hits = self.index.query_point(self.buffer.height - i, j, threshold)
+        return list(dict.fromkeys(reference[0] for _, reference in hits))
+
+    def __len__(self) -> int: 
+        return len(self.shapes)
+
+    def __getitem__(self, shape_id: int): 
+        return self.shapes[shape_id]
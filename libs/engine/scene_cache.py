@@ -0,0 +1,230 @@
+import os
+import sys
+import struct
+import hashlib
+import zlib
+from array import array
+
+from .script_loader import ScriptLoader
+from .diagnostics import ErrorContext
+from ..shapes import Polygon
+from ..ops import VertexArray
+
+class SceneCache:
+    """
+    Content-addressed on-disk cache of loaded scripts. 
+    Entries are keyed by sha256 of the loader version and the script bytes, and hold the 
+    screen-space vertices of every shape, the load errors and optionally the rasterized frame. 
+    The directory is kept under max_bytes by evicting the least recently used entries, 
+    recency being the file mtime, which every hit refreshes. 
+    """
+    MAGIC = b"SCN4"
+    # magic, byte order, height, width, number of shapes, number of errors
+    HEADER = struct.Struct("<4sBIIII")
+    # vertex count, closed flag, fill code
+    SHAPE = struct.Struct("<IBB")
+    # script line of an error, 0 when unknown
+    ERROR = struct.Struct("<I")
+    STRING = struct.Struct("<I")
+    # height, width, max pixel value, threshold: frames of other backends or thresholds are misses
+    FRAME = struct.Struct("<IIHd")
+
+    def __init__(self, directory: str, max_bytes: int=64 << 20) -> None:
+        if not isinstance(max_bytes, int) or max_bytes <= 0: 
+            raise ValueError(f"Cache size limit should be an integer greater than zero, got {max_bytes}. ")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # bytes of the entries, counted on the first write and kept up to date by the writes of this instance
+        self.size = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(filename: str, options: tuple=()) -> str: 
+        """
+        Hash the script contents together with the loader version and the loading options 
+        changing its shapes, None if the file cannot be read. 
+        """
+        digest = hashlib.sha256(f"{ScriptLoader.__name__}:{ScriptLoader.VERSION}:{options!r}:".encode())
+        try: 
+            with open(filename, 'rb') as file: 
+                for block in iter(lambda: file.read(1 << 16), b''): 
+                    digest.update(block)
+        except OSError: 
+            return None
+        return digest.hexdigest()
+
+    @staticmethod
+    def loader_key(loader: ScriptLoader) -> str: 
+        return SceneCache.key(loader.filename, (loader.lod_tolerance,))
+
+    def path(self, key: str, suffix: str) -> str: 
+        return os.path.join(self.directory, key + suffix)
+
+    @staticmethod
+    def encode_scene(height: int, width: int, shapes: list, errors: list) -> bytes: 
+        """Pack the (exception, traceback) error pairs, with their line and code, then the screen-space vertices of every shape"""
+        parts = [SceneCache.HEADER.pack(SceneCache.MAGIC, sys.byteorder == "little", height, width, len(shapes), len(errors))]
+        # errors come first, so that they can be reported without reading past them
+        for exception, traceback_details in errors: 
+            line = getattr(traceback_details, "line", None)
+            parts.append(SceneCache.ERROR.pack(0 if line is None else line))
+            for text in (exception, getattr(traceback_details, "code", "error"), traceback_details): 
+                data = str(text).encode()
+                parts.append(SceneCache.STRING.pack(len(data)))
+                parts.append(data)
+        for shape in shapes: 
+            vertex_array = shape.vertex_array
+            fill_code = {rule: code for code, rule in ScriptLoader.FILL_CODES.items()}[shape.fill]
+            parts.append(SceneCache.SHAPE.pack(len(vertex_array.xs), shape.is_closed, fill_code))
+            parts.append(vertex_array.xs.tobytes())
+            parts.append(vertex_array.ys.tobytes())
+        return b''.join(parts)
+
+    @staticmethod
+    def decode_scene(data: bytes): 
+        """Unpack (height, width, polygons, errors), the polygons having an identity transformation"""
+        height, width, errors, offset = SceneCache.decode_errors(data)
+        return height, width, list(SceneCache.decode_shapes(data, offset)), errors
+
+    @staticmethod
+    def decode_shapes(data: bytes, offset: int): 
+        """Yield the polygons of an entry one by one, from the offset where its errors end"""
+        _, little, _, _, num_shapes, _ = SceneCache.HEADER.unpack_from(data, 0)
+        for _ in range(num_shapes): 
+            count, is_closed, fill_code = SceneCache.SHAPE.unpack_from(data, offset)
+            offset += SceneCache.SHAPE.size
+            columns = []
+            for _ in range(2): 
+                column = array('d', data[offset:offset + 8 * count])
+                if little != (sys.byteorder == "little"): 
+                    column.byteswap()
+                columns.append(column)
+                offset += 8 * count
+            vertex_array = VertexArray()
+            vertex_array.xs, vertex_array.ys = columns
+            yield Polygon(vertices=vertex_array, is_closed=bool(is_closed), fill=ScriptLoader.FILL_CODES[fill_code])
+
+    @staticmethod
+    def decode_errors(data: bytes): 
+        """Unpack (height, width, errors, offset of the shapes) without decoding any shape"""
+        magic, _, height, width, _, num_errors = SceneCache.HEADER.unpack_from(data, 0)
+        if magic != SceneCache.MAGIC: 
+            raise ValueError(f"Invalid scene cache entry, got magic {magic}. ")
+        offset = SceneCache.HEADER.size
+        errors = []
+        for _ in range(num_errors): 
+            (line,) = SceneCache.ERROR.unpack_from(data, offset)
+            offset += SceneCache.ERROR.size
+            texts = []
+            for _ in range(3): 
+                (length,) = SceneCache.STRING.unpack_from(data, offset)
+                offset += SceneCache.STRING.size
+                texts.append(data[offset:offset + length].decode())
+                offset += length
+            exception, code, traceback_text = texts
+            context = ErrorContext(line=line or None, code=code)
+            context.text = traceback_text
+            errors.append((exception, context))
+        return height, width, errors, offset
+
+    def read(self, key: str, suffix: str): 
+        """Get the bytes of an entry and mark it as recently used, or None"""
+        path = self.path(key, suffix)
+        try: 
+            with open(path, 'rb') as file: 
+                data = file.read()
+            os.utime(path)
+        except OSError: 
+            return None
+        return data
+
+    def write(self, key: str, suffix: str, data: bytes) -> None: 
+        # written aside and renamed, so concurrent readers never see a partial entry
+        path = self.path(key, suffix)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as file: 
+            file.write(data)
+        try: 
+            replaced = os.stat(path).st_size
+        except OSError: 
+            replaced = 0
+        os.replace(temporary, path)
+        if self.size is None: 
+            self.size = sum(size for _, size, _ in self.entries())
+        else: 
+            self.size += len(data) - replaced
+        # the directory is only listed again once the limit is passed
+        if self.size > self.max_bytes: 
+            self.evict()
+
+    def load_script(self, loader: ScriptLoader, on_error=None, key: str=None) -> list: 
+        """
+        Get the shapes of the loader's script, parsing and transforming them only on a miss. 
+        Load errors are stored with the entry and reported again on every hit, where the shapes 
+        are decoded as they are iterated, so that a cached frame never needs them. 
+        """
+        report = on_error if on_error is not None else lambda exception, traceback_details: None
+        key = SceneCache.loader_key(loader) if key is None else key
+        if key is None: 
+            # unreadable scripts are not cached, the loader reports why
+            return list(loader.stream_shapes(on_error=report))
+        data = self.read(key, ".scene")
+        if data is not None: 
+            self.hits += 1
+            loader.height, loader.width, errors, offset = SceneCache.decode_errors(data)
+            for exception, traceback_details in errors: 
+                report(exception, traceback_details)
+            return SceneCache.decode_shapes(data, offset)
+        self.misses += 1
+        errors = []
+
+        def collect(exception: str, traceback_details: ErrorContext): 
+            errors.append((exception, traceback_details))
+            report(exception, traceback_details)
+
+        shapes = [shape.bake() for shape in loader.stream_shapes(on_error=collect)]
+        self.write(key, ".scene", SceneCache.encode_scene(loader.height, loader.width, shapes, errors))
+        return shapes
+
+    def load_frame(self, key: str, buffer, threshold: float=0.5) -> bool: 
+        """Draw the cached frame of an entry into an empty buffer of its size and pixel range, if there is one"""
+        data = self.read(key, ".frame")
+        if data is None: 
+            return False
+        if (buffer.height, buffer.width, buffer.max_value, threshold) != SceneCache.FRAME.unpack_from(data, 0): 
+            return False
+        buffer.merge_mask(zlib.decompress(data[SceneCache.FRAME.size:]))
+        return True
+
+    def store_frame(self, key: str, buffer, threshold: float=0.5) -> None: 
+        data = SceneCache.FRAME.pack(buffer.height, buffer.width, buffer.max_value, threshold) + zlib.compress(buffer.to_bytes())
+        self.write(key, ".frame", data)
+
+    def entries(self) -> list: 
+        """(mtime, size, path) of every entry of the directory"""
+        entries = []
+        for entry in os.scandir(self.directory): 
+            if entry.is_file() and entry.name.endswith((".scene", ".frame")): 
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self) -> None: 
+        """Remove the least recently used entries until the directory fits in max_bytes"""
+        # listing the directory also counts the entries written by other processes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries): 
+            if total <= self.max_bytes: 
+                break
+            try: 
+                os.remove(path)
+            except OSError: 
+                continue
+            total -= size
+        self.size = total
+
+    def info(self) -> dict: 
+        return {"hits": self.hits, "misses": self.misses, "max_bytes": self.max_bytes}
@@ -1,12 +1,26 @@
-import traceback
+import mmap
+import math
 
 from math import pi as PI
-from ..shapes import RegularPolygon
+from ..shapes import RegularPolygon, Ellipse
 from ..ops import Vector, Matrix
+from .diagnostics import ErrorContext
 
 class ScriptLoader:
-    def __init__(self, filename) -> None:
+    # bumped whenever parsing or shape building changes, invalidating cached scenes
+    VERSION = 4
+    # optional 7th parameter of a shape line
+    FILL_CODES = {0: None, 1: "evenodd", 2: "nonzero"}
+    # number of sides standing for an ellipse, a unit circle scaled by scale-x and scale-y
+    ELLIPSE_SIDES = 0
+
+    def __init__(self, filename, use_mmap: bool=False, lod_tolerance: float=None) -> None:
         self.filename = filename
+        self.use_mmap = use_mmap
+        # pixels of error allowed when dropping sides of large regular polygons, None keeps them all
+        if lod_tolerance is not None and not lod_tolerance > 0: 
+            raise ValueError(f"Level of detail tolerance should be greater than zero, got {lod_tolerance}. ")
+        self.lod_tolerance = lod_tolerance
         self.width, self.height = 10, 10 # default values
         self.shapes       = []
 
@@ -25,74 +39,139 @@ class ScriptLoader:
             if line[0] <= 0 or line[1] <= 0: 
                 raise ValueError(f"Window size parameters should be integers greater than zero, got {line[0]} and {line[1]}. ")
         
-        # other lines should give 6 parameters for each shape
+        # other lines should give 6 parameters for each shape, and optionally a fill code
         elif idx > 0: 
-            if len(line) != 6: 
+            numbers = all(isinstance(x, (int, float)) for x in line)
+            # a 7th parameter only counts as a fill code on an all-numeric line
+            if len(line) != 6 and not (len(line) == 7 and numbers): 
                 raise ValueError(f"Invalid script in line {idx+1}: incorrect number of parameters. ")
-            if any(not isinstance(x, (int, float)) for x in line): 
+            if not numbers: 
                 raise ValueError(f"Invalid script in line {idx+1}: invalid input. ")
-            
-    def read_script(self): 
-        # read script and return any errors caused by inputs
-        exceptions, traceback_details = [], []
-        
-        # catching file not found error and io error
-        try:
+            if len(line) == 7 and line[6] not in ScriptLoader.FILL_CODES: 
+                raise ValueError(f"Invalid script in line {idx+1}: fill should be 0 (outline), 1 (even-odd) or 2 (nonzero), got {line[6]}. ")
+
+    @staticmethod
+    def parse_token(token: str): 
+        """Parse a number without eval, anything else is kept as a string for input_format_check to reject"""
+        try: 
+            return int(token)
+        except ValueError: 
+            pass
+        try: 
+            number = float(token)
+        except ValueError: 
+            return token
+        # nan and inf are not valid script numbers
+        return number if math.isfinite(number) else token
+
+    def parse_line(self, line: str, idx: int) -> list: 
+        """Parse and check the idx-th line of the script, raising on invalid input"""
+        data_line = [ScriptLoader.parse_token(x) for x in line.split()]
+        ScriptLoader.input_format_check(data_line, idx)
+        return data_line
+
+    @staticmethod
+    def build_shape(line: list, lod_tolerance: float=None) -> RegularPolygon: 
+        """Create the shape described by a validated script line"""
+        # data format: n-sides, scale-x, scale-y, rot-degree, position-x, position-y[, fill]
+        num_sides, sx, sy, rot, px, py = line[:6]
+        if num_sides == ScriptLoader.ELLIPSE_SIDES: 
+            shape = Ellipse(rx=1.)
+        else: 
+            if lod_tolerance is not None: 
+                # the unit radius is scaled to at most the larger scale factor on screen
+                num_sides = RegularPolygon.lod_sides(num_sides, max(abs(sx), abs(sy)), lod_tolerance)
+            # initialize a uniform shape, its unit vertex table is shared through the cache
+            shape = RegularPolygon(num_sides=int(num_sides), radius=1.)
+        # apply affine transformation
+        shape.affine_transform(
+                transform_matrix=Matrix.scaling_matrix(a=float(sx), b=float(sy)) * Matrix.rotation_matrix(float(rot)*PI/180), 
+                translation_vector=Vector(elements=[float(px), float(py)])
+            )
+        if len(line) == 7: 
+            shape.fill = ScriptLoader.FILL_CODES[line[6]]
+        return shape
+
+    def iter_lines(self): 
+        """Yield the stripped, non-blank lines of the script one at a time"""
+        if not self.use_mmap: 
             with open(file=self.filename, mode='r') as file:
-                str_lines = [line.strip() for line in file if line.strip()]
+                for line in file: 
+                    if line.strip(): 
+                        yield line.strip()
+            return
+        # map the file instead of reading it through python buffers
+        with open(file=self.filename, mode='rb') as file:
+            # empty files cannot be mapped
+            if not file.seek(0, 2): 
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped: 
+                for raw in iter(mapped.readline, b''): 
+                    line = raw.decode().strip()
+                    if line: 
+                        yield line
+
+    def iter_records(self, on_error=None): 
+        """
+        Stream the script as validated (idx, numbers) records, window size first. 
+        Errors go to on_error(exception, traceback_details) and the faulty lines are skipped, 
+        traceback_details is an ErrorContext whose str() is the formatted traceback. 
+        """
+        report = on_error if on_error is not None else lambda exception, traceback_details: None
+        lines = self.iter_lines()
+
+        # catching file not found error, io error and blank input
+        try: 
+            first_line = next(lines)
         except FileNotFoundError as e:
-            exceptions.append(f"Error: The file '{self.filename}' does not exist.")
-            traceback_details.append(traceback.format_exc())
-            return exceptions, traceback_details
+            report(f"Error: The file '{self.filename}' does not exist.", ErrorContext.capture(code="file-not-found"))
+            return
         except IOError as e:
-            exceptions.append(f"Error: Cannot read the file. Details: {e}")
-            traceback_details.append(traceback.format_exc())
-            return exceptions, traceback_details
-        
-        # convert raw string data into numeric data
-        data_lines = [[eval(x) for x in line.split()] for line in str_lines]
-        num_lines = len(data_lines)
+            report(f"Error: Cannot read the file. Details: {e}", ErrorContext.capture(code="io-error"))
+            return
+        except StopIteration: 
+            report(f"Error in reading script: blank file as input. ", ErrorContext.capture(code="blank-input"))
+            return
 
-        # check if the inputs are in correct form
         # First line specifies the window size
+        header = [ScriptLoader.parse_token(x) for x in first_line.split()]
         try: 
-            ScriptLoader.input_format_check(data_lines[0], 0)
-        # handle the blank input error
-        except IndexError: 
-            exceptions.append(f"Error in reading script: blank file as input. ")
-            traceback_details.append(traceback.format_exc())
-            return exceptions, traceback_details
-        # handle input format error
+            ScriptLoader.input_format_check(header, 0)
         except (ValueError, TypeError) as e:
-            exceptions.append(f"Error in reading script: {e}")
-            traceback_details.append(traceback.format_exc())
-            return exceptions, traceback_details
-        else:
-            # if everything is correct, assign shape values
-            self.height, self.width = int(data_lines[0][0]), int(data_lines[0][1])
-        
-        # initiate each shape
-        for idx in range(1, num_lines):                         
+            report(f"Error in reading script: {e}", ErrorContext.capture(line=1, code="bad-header"))
+            return
+        self.height, self.width = int(header[0]), int(header[1])
+        yield 0, header
+
+        # check each shape line as it is read
+        for idx, line in enumerate(lines, start=1): 
             try: 
-                ScriptLoader.input_format_check(data_lines[idx], idx)
+                data_line = self.parse_line(line, idx)
             except Exception as e:
-                exceptions.append(f"Error in reading script: {e}")
-                traceback_details.append(traceback.format_exc())
+                report(f"Error in reading script: {e}", ErrorContext.capture(line=idx + 1, code="bad-line"))
                 # Skip incorrect line and continue to load data
                 continue
+            yield idx, data_line
 
-            # data format: n-sides, scale-x, scale-y, rot-degree, position-x, position-y
-            num_sides, sx, sy, rot, px, py = data_lines[idx]
-            # initialize a uniform shape
-            shape = RegularPolygon(num_sides=int(num_sides), radius=1.)
-            # apply affine transformation
-            shape.affine_transform(
-                    transform_matrix=Matrix.scaling_matrix(a=float(sx), b=float(sy)) * Matrix.rotation_matrix(float(rot)*PI/180), 
-                    translation_vector=Vector(elements=[float(px), float(py)])
-                )
-            # append to list
-            self.shapes.append(shape)
+    def stream_shapes(self, on_error=None): 
+        """
+        Read the window size eagerly, so get_size() is valid once this returns, 
+        and return a generator creating the shapes of the remaining lines on demand. 
+        """
+        records = self.iter_records(on_error=on_error)
+        if next(records, None) is None: 
+            return iter(())
+        return (ScriptLoader.build_shape(line, self.lod_tolerance) for _, line in records)
             
+    def read_script(self): 
+        # read script and return any errors caused by inputs, tracebacks formatted as text
+        exceptions, traceback_details = [], []
+
+        def collect(exception: str, traceback_detail: ErrorContext): 
+            exceptions.append(exception)
+            traceback_details.append(str(traceback_detail))
+
+        self.shapes.extend(self.stream_shapes(on_error=collect))
         return exceptions, traceback_details
     
     def get_size(self) -> tuple[int, int]: 
@@ -0,0 +1,148 @@
+from math import floor
+
+from .buffer import Buffer
+
+class SegmentGrid:
+    """
+    Uniform grid over shape segments in script coordinates, where pixel (i, j) sits at (height - i, j). 
+    Segments are inserted and removed per key, e.g. a shape id, and referred to as (key, index). 
+    """
+    def __init__(self, cell_size: int=16) -> None:
+        if not isinstance(cell_size, int) or cell_size <= 0: 
+            raise ValueError(f"Cell size should be an integer greater than zero, got {cell_size}. ")
+        self.cell_size = cell_size
+        self.cells = {}       # (cx, cy) -> set of segment references
+        self.items = {}       # key -> segment table
+        self.item_cells = {}  # key -> cells touched by its segments
+        self.extent = None    # (min cx, max cx, min cy, max cy) ever occupied, bounds ring searches
+
+    @staticmethod
+    def from_shapes(shapes, cell_size: int=16): 
+        """Index the segments of every shape, keyed by position in the iterable"""
+        index = SegmentGrid(cell_size=cell_size)
+        for key, shape in enumerate(shapes): 
+            index.insert(key, shape.segments())
+        return index
+
+    def cell_range(self, x_lo: float, x_hi: float, y_lo: float, y_hi: float) -> tuple[int, int, int, int]: 
+        size = self.cell_size
+        return floor(x_lo / size), floor(x_hi / size), floor(y_lo / size), floor(y_hi / size)
+
+    def insert(self, key, segments: list) -> None: 
+        """Index a segment table under key, replacing what was stored under it"""
+        if key in self.items: 
+            self.remove(key)
+        segments = list(segments)
+        touched = set()
+        for k, (ax, ay, bx, by) in enumerate(segments): 
+            cx_lo, cx_hi, cy_lo, cy_hi = self.cell_range(min(ax, bx), max(ax, bx), min(ay, by), max(ay, by))
+            for cx in range(cx_lo, cx_hi + 1): 
+                for cy in range(cy_lo, cy_hi + 1): 
+                    self.cells.setdefault((cx, cy), set()).add((key, k))
+                    touched.add((cx, cy))
+        self.items[key] = segments
+        self.item_cells[key] = touched
+        if touched: 
+            cxs, cys = [cell[0] for cell in touched], [cell[1] for cell in touched]
+            extent = (min(cxs), max(cxs), min(cys), max(cys)) if self.extent is None else self.extent
+            self.extent = (min(extent[0], min(cxs)), max(extent[1], max(cxs)), 
+                           min(extent[2], min(cys)), max(extent[3], max(cys)))
+
+    def remove(self, key) -> None: 
+        for cell in self.item_cells.pop(key): 
+            references = self.cells[cell]
+            references.difference_update([reference for reference in references if reference[0] == key])
+            if not references: 
+                del self.cells[cell]
+        del self.items[key]
+
+    def segment(self, reference: tuple) -> tuple[float, float, float, float]: 
+        key, k = reference
+        return self.items[key][k]
+
+    def query_rect(self, x_lo: float, x_hi: float, y_lo: float, y_hi: float) -> set: 
+        """Get the references of the segments whose bounding box overlaps the rectangle"""
+        cx_lo, cx_hi, cy_lo, cy_hi = self.cell_range(x_lo, x_hi, y_lo, y_hi)
+        result = set()
+        for cx in range(cx_lo, cx_hi + 1): 
+            for cy in range(cy_lo, cy_hi + 1): 
+                for reference in self.cells.get((cx, cy), ()): 
+                    if reference in result: 
+                        continue
+                    ax, ay, bx, by = self.segment(reference)
+                    if min(ax, bx) <= x_hi and max(ax, bx) >= x_lo and min(ay, by) <= y_hi and max(ay, by) >= y_lo: 
+                        result.add(reference)
+        return result
+
+    def query_point(self, x: float, y: float, threshold: float=0.5) -> list[tuple]: 
+        """Pick the segments within threshold of a point, as (distance, reference) nearest first"""
+        result = []
+        margin = threshold + 1
+        for reference in self.query_rect(x - margin, x + margin, y - margin, y + margin): 
+            distance = Buffer.point_to_segment_distance(x, y, *self.segment(reference))
+            if distance <= threshold: 
+                result.append((distance, reference))
+        return sorted(result)
+
+    def nearest_edge(self, x: float, y: float, max_distance: float=None): 
+        """Get (distance, reference) of the closest segment, or None if there is none within max_distance"""
+        if not self.cells: 
+            return None
+        cx, cy = floor(x / self.cell_size), floor(y / self.cell_size)
+        # rings beyond every occupied cell cannot hold anything
+        max_ring = max(abs(self.extent[0] - cx), abs(self.extent[1] - cx), abs(self.extent[2] - cy), abs(self.extent[3] - cy))
+        best, seen = None, set()
+        for ring in range(max_ring + 1): 
+            # segments outside the rings searched so far are at least this far away
+            if best is not None and best[0] <= (ring - 1) * self.cell_size: 
+                break
+            if max_distance is not None and (ring - 1) * self.cell_size > max_distance: 
+                break
+            for cell in SegmentGrid.ring_cells(cx, cy, ring): 
+                for reference in self.cells.get(cell, ()): 
+                    if reference in seen: 
+                        continue
+                    seen.add(reference)
+                    distance = Buffer.point_to_segment_distance(x, y, *self.segment(reference))
+                    if best is None or (distance, reference) < best: 
+                        best = (distance, reference)
+        if best is None or (max_distance is not None and best[0] > max_distance): 
+            return None
+        return best
+
+    @staticmethod
+    def ring_cells(cx: int, cy: int, ring: int) -> list[tuple[int, int]]: 
+        """Cells at Chebyshev distance ring from (cx, cy)"""
+        if ring == 0: 
+            return [(cx, cy)]
+        cells = []
+        for dx in range(-ring, ring + 1): 
+            cells.append((cx + dx, cy - ring))
+            cells.append((cx + dx, cy + ring))
+        for dy in range(-ring + 1, ring): 
+            cells.append((cx - ring, cy + dy))
+            cells.append((cx + ring, cy + dy))
+        return cells
+
+    def region_segments(self, buffer: Buffer, region: tuple, threshold: float=0.5) -> list: 
+        """Get the segments which may reach a pixel window of buffer"""
+        i_lo, i_hi, j_lo, j_hi = region
+        # one pixel of slack, as in Buffer.segment_window
+        margin = buffer.reach(threshold) + 1
+        references = self.query_rect(buffer.height - i_hi - margin, buffer.height - i_lo + margin, 
+                                     j_lo - margin, j_hi + margin)
+        return [self.segment(reference) for reference in references]
+
+    def rasterize(self, buffer: Buffer, threshold: float=0.5, region: tuple=None) -> None: 
+        """Draw the indexed segments tile by tile, each tile only testing the segments near it"""
+        size = self.cell_size
+        i_lo, i_hi, j_lo, j_hi = (0, buffer.height - 1, 0, buffer.width - 1) if region is None else region
+        for tile_i in range(i_lo, i_hi + 1, size): 
+            for tile_j in range(j_lo, j_hi + 1, size): 
+                tile = (tile_i, min(i_hi, tile_i + size - 1), tile_j, min(j_hi, tile_j + size - 1))
+                segments = self.region_segments(buffer, tile, threshold)
+                if segments: 
+                    buffer.draw_segments(segments, threshold, tile)
+
+    def __len__(self) -> int: 
+        return sum(len(segments) for segments in self.items.values())
@@ -0,0 +1,159 @@
+import sys
+import time
+import asyncio
+
+from .buffer import Buffer
+from .script_loader import ScriptLoader
+from .writers import encode_rows
+from .diagnostics import ErrorContext
+
+class StreamRenderer:
+    """
+    Renders a script arriving line by line into a persistent buffer. 
+    The first line sizes the buffer and each shape is rasterized as soon as its line is read. 
+    Changed rows are emitted in bands by a separate task: while a slow consumer holds it, 
+    ingestion goes on and marks bands dirty, so pending updates coalesce instead of queueing up. 
+    """
+    def __init__(self, on_error=None, backend: str="python", threshold: float=0.5, band_rows: int=8, mode: str=None) -> None:
+        if not isinstance(band_rows, int) or band_rows <= 0: 
+            raise ValueError(f"Band height should be an integer greater than zero, got {band_rows}. ")
+        self.report = on_error if on_error is not None else lambda exception, traceback_details: None
+        self.backend = backend
+        self.threshold = threshold
+        self.band_rows = band_rows
+        # grayscale buffers are shaded unless a mode is given
+        self.mode = mode
+        self.loader = ScriptLoader(filename=None)
+        self.buffer = None
+        self.idx = 0
+        self.dirty = set()  # indices of the bands changed since they were last emitted
+        self.changed = asyncio.Event()
+        self.done = False
+        self.counts = {"records read": 0, "bands emitted": 0, "bands coalesced": 0}
+        self.start = time.perf_counter()
+        self.first_band = None  # seconds from start to the first emitted band
+
+    def feed(self, line: str) -> None: 
+        """Parse and draw one script line, marking the bands it touched dirty"""
+        line = line.strip()
+        if not line: 
+            return
+        idx, self.idx = self.idx, self.idx + 1
+        self.counts["records read"] += 1
+        if idx == 0: 
+            header = [ScriptLoader.parse_token(x) for x in line.split()]
+            try: 
+                ScriptLoader.input_format_check(header, 0)
+            except (ValueError, TypeError) as e: 
+                self.report(f"Error in reading script: {e}", ErrorContext.capture(line=idx + 1, code="bad-header"))
+                raise
+            self.buffer = Buffer.create(height=int(header[0]), width=int(header[1]), backend=self.backend)
+            # the empty canvas is the first frame
+            self.mark((0, self.buffer.height - 1))
+            return
+        try: 
+            shape = ScriptLoader.build_shape(self.loader.parse_line(line, idx))
+        except Exception as e: 
+            self.report(f"Error in reading script: {e}", ErrorContext.capture(line=idx + 1, code="bad-line"))
+            return
+        segments = shape.segments()
+        windows = [self.buffer.segment_window(*segment, self.buffer.reach(self.threshold)) for segment in segments]
+        windows = [window for window in windows if window is not None]
+        if not windows: 
+            return
+        self.buffer.render([shape], self.threshold)
+        self.mark((min(window[0] for window in windows), max(window[1] for window in windows)))
+
+    def mark(self, rows: tuple) -> None: 
+        for band in range(rows[0] // self.band_rows, rows[1] // self.band_rows + 1): 
+            if band in self.dirty: 
+                self.counts["bands coalesced"] += 1
+            self.dirty.add(band)
+        self.changed.set()
+
+    async def ingest(self, lines) -> None: 
+        """Consume an async iterator of lines, yielding to the emitter after every line"""
+        try: 
+            async for line in lines: 
+                try: 
+                    self.feed(line)
+                except (ValueError, TypeError): 
+                    # invalid header, nothing can be drawn
+                    break
+                await asyncio.sleep(0)
+            if self.idx == 0: 
+                self.report(f"Error in reading script: blank file as input. ", ErrorContext(code="blank-input"))
+        finally: 
+            self.done = True
+            self.changed.set()
+
+    async def emit(self, write) -> None: 
+        """Write the dirty bands through the coroutine write(text) until ingestion is over"""
+        while True: 
+            await self.changed.wait()
+            self.changed.clear()
+            bands, self.dirty = sorted(self.dirty), set()
+            for band in bands: 
+                i_lo = band * self.band_rows
+                i_hi = min(self.buffer.height, i_lo + self.band_rows) - 1
+                # a slow consumer only delays this task
+                await write(f"rows {i_lo} {i_hi}\n" + encode_rows(self.buffer, i_lo, i_hi, self.text_mode()))
+                self.counts["bands emitted"] += 1
+                if self.first_band is None: 
+                    self.first_band = time.perf_counter() - self.start
+            if self.done and not self.dirty: 
+                return
+
+    def text_mode(self) -> str: 
+        if self.mode is not None: 
+            return self.mode
+        return "shade" if self.buffer.max_value > 1 else "square"
+
+    async def run(self, lines, write) -> Buffer: 
+        """Ingest lines and emit bands concurrently, get the final buffer"""
+        emitter = asyncio.ensure_future(self.emit(write))
+        await self.ingest(lines)
+        await emitter
+        await write("end\n")
+        return self.buffer
+
+
+async def stdin_lines(): 
+    """Lines of stdin as they arrive, read off the event loop so any kind of input works"""
+    loop = asyncio.get_running_loop()
+    while True: 
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line: 
+            return
+        yield line
+
+async def socket_lines(host: str, port: int, ready=None): 
+    """Lines sent by the first client connecting to a local TCP socket"""
+    connected = asyncio.get_running_loop().create_future()
+
+    async def accept(reader, writer): 
+        connected.set_result((reader, writer))
+
+    server = await asyncio.start_server(accept, host, port)
+    if ready is not None: 
+        ready(server)
+    async with server: 
+        reader, writer = await connected
+        server.close()
+        try: 
+            async for line in reader: 
+                yield line.decode()
+        finally: 
+            writer.close()
+
+def stream_writer(stream=None): 
+    """Coroutine writing text to a stream from a worker thread, so a blocked consumer never blocks the loop"""
+    stream = sys.stdout if stream is None else stream
+
+    def write_now(text: str) -> None: 
+        stream.write(text)
+        stream.flush()
+
+    async def write(text: str) -> None: 
+        await asyncio.get_running_loop().run_in_executor(None, write_now, text)
+    return write
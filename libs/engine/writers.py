@@ -0,0 +1,141 @@
+import os
+import struct
+import zlib
+
+# glyph tables for the text modes, indexed by pixel value
+TEXT_GLYPHS = {
+    "default": [str(value) for value in range(256)], 
+    "square": ['□'] + ['■'] * 255, 
+    "shade": [' ', '░', '▒', '▓', '█'], 
+}
+# modes whose glyphs are spread over the 8-bit gray level instead of indexed by the pixel value
+SHADED_MODES = {"shade"}
+
+def text_glyphs(buffer, mode: str): 
+    """Get the pixel value to glyph lookup of a text mode"""
+    if mode not in TEXT_GLYPHS: 
+        raise ValueError(f"Unspecified mode {mode}, expected one of {list(TEXT_GLYPHS)}. ")
+    if mode not in SHADED_MODES: 
+        return TEXT_GLYPHS[mode].__getitem__
+    glyphs = TEXT_GLYPHS[mode]
+    # the lightest glyph is only for empty pixels
+    table = [glyphs[0]] + [glyphs[1 + (value * (len(glyphs) - 1) - 1) // buffer.max_value] for value in range(1, buffer.max_value + 1)]
+    return table.__getitem__
+
+# pixel value to ascii bit for PBM
+PBM_BITS = bytes(ord('0') if value == 0 else ord('1') for value in range(256))
+# rows encoded per chunk when writing, so only one strip of a file-backed canvas is unpacked at a time
+CHUNK_ROWS = 256
+# compressed bytes gathered before a PNG IDAT chunk is written
+IDAT_BYTES = 1 << 20
+
+def split_rows(pixels: bytes, width: int) -> list[bytes]: 
+    """Split row-major pixel bytes into rows"""
+    if width == 0: 
+        return []
+    return [pixels[start:start + width] for start in range(0, len(pixels), width)]
+
+def encode_text(buffer, mode: str="default") -> str: 
+    """Encode the whole buffer as text, one line per row"""
+    glyphs = text_glyphs(buffer, mode)
+    if buffer.width == 0: 
+        return '\n' * buffer.height
+    return ''.join(' '.join(map(glyphs, row)) + '\n' for row in split_rows(buffer.to_bytes(), buffer.width))
+
+def row_chunks(buffer, rows: int=None): 
+    """Split the rows into (first row, last row) chunks"""
+    rows = CHUNK_ROWS if rows is None else rows
+    return [(i_lo, min(buffer.height, i_lo + rows) - 1) for i_lo in range(0, buffer.height, rows)]
+
+def iter_text(buffer, mode: str="default"): 
+    """Encode as text, one chunk of rows at a time"""
+    glyphs = text_glyphs(buffer, mode)
+    for i_lo, i_hi in row_chunks(buffer): 
+        if buffer.width == 0: 
+            yield ('\n' * (i_hi - i_lo + 1)).encode()
+            continue
+        yield ''.join(' '.join(map(glyphs, row)) + '\n' for row in split_rows(buffer.to_bytes(i_lo, i_hi), buffer.width)).encode()
+
+def encode_rows(buffer, i_lo: int, i_hi: int, mode: str="default") -> str: 
+    """Encode rows i_lo to i_hi as text, one line per row"""
+    glyphs = text_glyphs(buffer, mode)
+    return ''.join(' '.join(map(glyphs, bytes(buffer.data[i]))) + '\n' for i in range(i_lo, i_hi + 1))
+
+def gray_levels(buffer, i_lo: int=0, i_hi: int=None) -> bytes: 
+    """Map pixel values of rows i_lo to i_hi, all by default, to 8-bit gray, set pixels black on a white background"""
+    table = bytes(255 - min(255, value * 255 // buffer.max_value) for value in range(256))
+    return buffer.to_bytes(i_lo, i_hi).translate(table)
+
+def pack_bits(pixels: bytes, width: int) -> bytes: 
+    """Pack row-major pixel bytes 1 bit each, most significant bit first, rows padded to whole bytes"""
+    row_bytes = (width + 7) // 8
+    padding = b'0' * (row_bytes * 8 - width)
+    # each row is read as one binary number
+    return b''.join(
+        int(row + padding, 2).to_bytes(row_bytes, 'big') 
+        for row in split_rows(pixels.translate(PBM_BITS), width)
+    )
+
+def iter_pbm(buffer): 
+    """Encode as binary PBM (P4), 1 bit per pixel, one chunk of rows at a time"""
+    yield f"P4\n{buffer.width} {buffer.height}\n".encode()
+    for i_lo, i_hi in row_chunks(buffer): 
+        yield buffer.to_bits(i_lo, i_hi)
+
+def iter_pgm(buffer): 
+    """Encode as binary PGM (P5), 8 bits per pixel, one chunk of rows at a time"""
+    yield f"P5\n{buffer.width} {buffer.height}\n255\n".encode()
+    for i_lo, i_hi in row_chunks(buffer): 
+        yield gray_levels(buffer, i_lo, i_hi)
+
+def encode_pbm(buffer) -> bytes: 
+    return b''.join(iter_pbm(buffer))
+
+def encode_pgm(buffer) -> bytes: 
+    return b''.join(iter_pgm(buffer))
+
+def png_chunk(kind: bytes, data: bytes) -> bytes: 
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def iter_png(buffer, level: int=6): 
+    """Encode as 8-bit grayscale PNG, using only zlib from the standard library, one chunk of rows at a time"""
+    header = struct.pack(">IIBBBBB", buffer.width, buffer.height, 8, 0, 0, 0, 0)
+    yield b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', header)
+    compressor = zlib.compressobj(level)
+    pending = []
+    for i_lo, i_hi in row_chunks(buffer): 
+        # every scanline starts with filter type 0
+        raw = b''.join(b'\x00' + row for row in split_rows(gray_levels(buffer, i_lo, i_hi), buffer.width))
+        pending.append(compressor.compress(raw))
+        if sum(map(len, pending)) >= IDAT_BYTES: 
+            yield png_chunk(b'IDAT', b''.join(pending))
+            pending = []
+    pending.append(compressor.flush())
+    yield png_chunk(b'IDAT', b''.join(pending)) + png_chunk(b'IEND', b'')
+
+def encode_png(buffer, level: int=6) -> bytes: 
+    return b''.join(iter_png(buffer, level))
+
+# format -> generator of the encoded chunks
+ENCODERS = {
+    ".png": iter_png, 
+    ".pgm": iter_pgm, 
+    ".pbm": iter_pbm, 
+    ".txt": iter_text, 
+}
+
+def encode(buffer, file_format: str) -> bytes: 
+    """Encode the buffer for a format given as a file extension"""
+    file_format = file_format.lower() if file_format.startswith('.') else '.' + file_format.lower()
+    if file_format not in ENCODERS: 
+        raise ValueError(f"Unsupported output format {file_format}, expected one of {list(ENCODERS)}. ")
+    return b''.join(ENCODERS[file_format](buffer))
+
+def write_image(buffer, filename: str) -> None: 
+    """Write the buffer to a file one chunk of rows at a time, the format is taken from the extension"""
+    file_format = os.path.splitext(filename)[1].lower()
+    if file_format not in ENCODERS: 
+        raise ValueError(f"Unsupported output format {file_format}, expected one of {list(ENCODERS)}. ")
+    with open(filename, 'wb') as file_handler: 
+        for data in ENCODERS[file_format](buffer): 
+            file_handler.write(data)
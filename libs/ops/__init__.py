@@ -1,2 +1,5 @@
 from .vector import Vector
-from .matrix import Matrix
\ No newline at end of file
+from .matrix import Matrix
+from .compact import Vec2, Vec3, Mat2, Mat3
+from .vertex_array import VertexArray
+from .affine import Affine2D
\ No newline at end of file
@@ -0,0 +1,92 @@
+from math import sin, cos
+from . import Vector, Matrix, Vec2, Mat2, VertexArray
+
+class Affine2D:
+    """
+    Homogeneous 2D affine transformation [[a, b, tx], [c, d, ty], [0, 0, 1]]. 
+    A * B applies B first, then A. 
+    """
+    __slots__ = ("a", "b", "c", "d", "tx", "ty", "inverse_cache")
+
+    def __init__(self, a: float=1., b: float=0., c: float=0., d: float=1., tx: float=0., ty: float=0.) -> None:
+        self.a, self.b, self.tx = a, b, tx
+        self.c, self.d, self.ty = c, d, ty
+        self.inverse_cache = None
+
+    @staticmethod
+    def identity(): 
+        return Affine2D()
+
+    @staticmethod
+    def from_matrix(transform_matrix: Matrix, translation_vector: Vector=None): 
+        """Build from a 2x2 Matrix and an optional translation Vector, as used by Shape.affine_transform"""
+        matrix = Mat2.from_matrix(transform_matrix)
+        offset = Vec2(0., 0.) if translation_vector is None else Vec2.from_vector(translation_vector)
+        return Affine2D(matrix.a, matrix.b, matrix.c, matrix.d, offset.x, offset.y)
+
+    @staticmethod
+    def translation(dx: float, dy: float): 
+        return Affine2D(tx=dx, ty=dy)
+
+    @staticmethod
+    def scaling(sx: float, sy: float): 
+        return Affine2D(a=sx, d=sy)
+
+    @staticmethod
+    def rotation(theta: float): 
+        return Affine2D(a=cos(theta), b=-sin(theta), c=sin(theta), d=cos(theta))
+
+    @property
+    def determinant(self) -> float: 
+        return self.a * self.d - self.b * self.c
+
+    def is_identity(self) -> bool: 
+        return (self.a, self.b, self.c, self.d, self.tx, self.ty) == (1, 0, 0, 1, 0, 0)
+
+    def compose(self, other): 
+        """Get the transformation applying other first, then self"""
+        if not isinstance(other, Affine2D): 
+            raise TypeError(f"Affine2D can only be composed with Affine2D, not {type(other)}")
+        return Affine2D(
+            self.a * other.a + self.b * other.c, self.a * other.b + self.b * other.d, 
+            self.c * other.a + self.d * other.c, self.c * other.b + self.d * other.d, 
+            self.a * other.tx + self.b * other.ty + self.tx, 
+            self.c * other.tx + self.d * other.ty + self.ty
+            )
+
+    __mul__ = compose
+    __matmul__ = compose
+
+    def inverse(self): 
+        """Get the inverse transformation, computed once and cached"""
+        if self.inverse_cache is None: 
+            det = self.determinant
+            if det == 0: 
+                raise ValueError(f"Singular transformation {self} cannot be inverted. ")
+            a, b, c, d = self.d / det, -self.b / det, -self.c / det, self.a / det
+            self.inverse_cache = Affine2D(a, b, c, d, -(a * self.tx + b * self.ty), -(c * self.tx + d * self.ty))
+            self.inverse_cache.inverse_cache = self
+        return self.inverse_cache
+
+    def apply(self, x: float, y: float) -> tuple[float, float]: 
+        return self.a * x + self.b * y + self.tx, self.c * x + self.d * y + self.ty
+
+    def apply_vector(self, vector: Vector) -> Vector: 
+        return Vec2(*self.apply(*Vec2.from_vector(vector))).to_vector()
+
+    def apply_array(self, vertex_array: VertexArray) -> VertexArray: 
+        """Get a transformed copy of the vertex array, the input is left untouched"""
+        result = vertex_array.copy()
+        result.transform(Mat2(self.a, self.b, self.c, self.d), Vec2(self.tx, self.ty))
+        return result
+
+    def to_matrix(self) -> Matrix: 
+        """Get the homogeneous 3x3 Matrix"""
+        return Matrix(rows=[[self.a, self.b, self.tx], [self.c, self.d, self.ty], [0., 0., 1.]])
+
+    def __eq__(self, other) -> bool: 
+        return isinstance(other, Affine2D) and \
+            (self.a, self.b, self.c, self.d, self.tx, self.ty) == (other.a, other.b, other.c, other.d, other.tx, other.ty)
+
+    def __repr__(self) -> str: 
+        return f"Affine2D[[{self.a}, {self.b}, {self.tx}], [{self.c}, {self.d}, {self.ty}]]"
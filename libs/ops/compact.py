@@ -0,0 +1,191 @@
+from . import Vector, Matrix
+
+# Compact 2D/3D vector and matrix types for internal hot paths. 
+# They skip the validation done by Vector and Matrix, so inputs must be 
+# checked at the API boundary (from_vector / from_matrix) before use. 
+
+class Vec2:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float, y: float) -> None:
+        self.x = x
+        self.y = y
+
+    @staticmethod
+    def from_vector(vector: Vector): 
+        if not isinstance(vector, Vector) or vector.dim != 2: 
+            raise ValueError(f"Expected a 2-dimensional Vector, got {vector}. ")
+        return Vec2(vector[0], vector[1])
+
+    def to_vector(self) -> Vector: 
+        # elements are already numbers, skip the Vector validation
+        vector = Vector.__new__(Vector)
+        vector.data = [self.x, self.y]
+        return vector
+
+    def __add__(self, other): 
+        return Vec2(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other): 
+        return Vec2(self.x - other.x, self.y - other.y)
+
+    def __mul__(self, factor: float): 
+        return Vec2(factor * self.x, factor * self.y)
+
+    __rmul__ = __mul__
+
+    def dot_product(self, input_) -> float: 
+        return self.x * input_.x + self.y * input_.y
+
+    def norm(self) -> float: 
+        return (self.x ** 2 + self.y ** 2) ** .5
+
+    def __iter__(self): 
+        return iter((self.x, self.y))
+
+    def __len__(self) -> int: 
+        return 2
+
+    def __getitem__(self, index) -> float: 
+        return (self.x, self.y)[index]
+
+    def __eq__(self, other) -> bool: 
+        return isinstance(other, Vec2) and self.x == other.x and self.y == other.y
+
+    def __repr__(self) -> str: 
+        return f"Vec2({self.x}, {self.y})"
+
+
+class Vec3:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x: float, y: float, z: float) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @staticmethod
+    def from_vector(vector: Vector): 
+        if not isinstance(vector, Vector) or vector.dim != 3: 
+            raise ValueError(f"Expected a 3-dimensional Vector, got {vector}. ")
+        return Vec3(vector[0], vector[1], vector[2])
+
+    def to_vector(self) -> Vector: 
+        vector = Vector.__new__(Vector)
+        vector.data = [self.x, self.y, self.z]
+        return vector
+
+    def __add__(self, other): 
+        return Vec3(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other): 
+        return Vec3(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, factor: float): 
+        return Vec3(factor * self.x, factor * self.y, factor * self.z)
+
+    __rmul__ = __mul__
+
+    def dot_product(self, input_) -> float: 
+        return self.x * input_.x + self.y * input_.y + self.z * input_.z
+
+    def norm(self) -> float: 
+        return (self.x ** 2 + self.y ** 2 + self.z ** 2) ** .5
+
+    def __iter__(self): 
+        return iter((self.x, self.y, self.z))
+
+    def __len__(self) -> int: 
+        return 3
+
+    def __getitem__(self, index) -> float: 
+        return (self.x, self.y, self.z)[index]
+
+    def __eq__(self, other) -> bool: 
+        return isinstance(other, Vec3) and self.x == other.x and self.y == other.y and self.z == other.z
+
+    def __repr__(self) -> str: 
+        return f"Vec3({self.x}, {self.y}, {self.z})"
+
+
+class Mat2:
+    """Row-major 2x2 matrix [[a, b], [c, d]]"""
+    __slots__ = ("a", "b", "c", "d")
+
+    def __init__(self, a: float, b: float, c: float, d: float) -> None:
+        self.a, self.b = a, b
+        self.c, self.d = c, d
+
+    @staticmethod
+    def from_matrix(matrix: Matrix): 
+        if not isinstance(matrix, Matrix) or matrix.dim != (2, 2): 
+            raise ValueError(f"Expected a 2x2 Matrix, got {matrix}. ")
+        (a, b), (c, d) = matrix.data
+        return Mat2(a, b, c, d)
+
+    def to_matrix(self) -> Matrix: 
+        return Matrix(rows=[[self.a, self.b], [self.c, self.d]])
+
+    def __mul__(self, other): 
+        # right multiply a vector
+        if isinstance(other, Vec2): 
+            return Vec2(self.a * other.x + self.b * other.y, 
+                        self.c * other.x + self.d * other.y)
+        # right multiply a matrix
+        if isinstance(other, Mat2): 
+            return Mat2(self.a * other.a + self.b * other.c, self.a * other.b + self.b * other.d, 
+                        self.c * other.a + self.d * other.c, self.c * other.b + self.d * other.d)
+        # scale by number
+        return Mat2(other * self.a, other * self.b, other * self.c, other * self.d)
+
+    def __repr__(self) -> str: 
+        return f"Mat2[[{self.a}, {self.b}], [{self.c}, {self.d}]]"
+
+
+class Mat3:
+    """Row-major 3x3 matrix"""
+    __slots__ = ("m00", "m01", "m02", "m10", "m11", "m12", "m20", "m21", "m22")
+
+    def __init__(self, m00, m01, m02, m10, m11, m12, m20, m21, m22) -> None:
+        self.m00, self.m01, self.m02 = m00, m01, m02
+        self.m10, self.m11, self.m12 = m10, m11, m12
+        self.m20, self.m21, self.m22 = m20, m21, m22
+
+    @staticmethod
+    def from_matrix(matrix: Matrix): 
+        if not isinstance(matrix, Matrix) or matrix.dim != (3, 3): 
+            raise ValueError(f"Expected a 3x3 Matrix, got {matrix}. ")
+        return Mat3(*matrix.data[0], *matrix.data[1], *matrix.data[2])
+
+    def to_matrix(self) -> Matrix: 
+        return Matrix(rows=[
+            [self.m00, self.m01, self.m02], 
+            [self.m10, self.m11, self.m12], 
+            [self.m20, self.m21, self.m22]
+            ])
+
+    def __mul__(self, other): 
+        # right multiply a vector
+        if isinstance(other, Vec3): 
+            return Vec3(self.m00 * other.x + self.m01 * other.y + self.m02 * other.z, 
+                        self.m10 * other.x + self.m11 * other.y + self.m12 * other.z, 
+                        self.m20 * other.x + self.m21 * other.y + self.m22 * other.z)
+        # right multiply a matrix
+        if isinstance(other, Mat3): 
+            return Mat3(
+                self.m00 * other.m00 + self.m01 * other.m10 + self.m02 * other.m20, 
+                self.m00 * other.m01 + self.m01 * other.m11 + self.m02 * other.m21, 
+                self.m00 * other.m02 + self.m01 * other.m12 + self.m02 * other.m22, 
+                self.m10 * other.m00 + self.m11 * other.m10 + self.m12 * other.m20, 
+                self.m10 * other.m01 + self.m11 * other.m11 + self.m12 * other.m21, 
+                self.m10 * other.m02 + self.m11 * other.m12 + self.m12 * other.m22, 
+                self.m20 * other.m00 + self.m21 * other.m10 + self.m22 * other.m20, 
+                self.m20 * other.m01 + self.m21 * other.m11 + self.m22 * other.m21, 
+                self.m20 * other.m02 + self.m21 * other.m12 + self.m22 * other.m22
+                )
+        # scale by number
+        return Mat3(*(other * getattr(self, name) for name in Mat3.__slots__))
+
+    def __repr__(self) -> str: 
+        return (f"Mat3[[{self.m00}, {self.m01}, {self.m02}], "
+                f"[{self.m10}, {self.m11}, {self.m12}], [{self.m20}, {self.m21}, {self.m22}]]")
@@ -0,0 +1,107 @@
+from array import array
+try: 
+    import numpy as np
+except ImportError: 
+    np = None
+
+from . import Vector, Vec2, Mat2
+
+class VertexArray:
+    """
+    Packed 2D vertices stored as two array('d') columns. 
+    Costs 16 bytes per vertex instead of a Vector object and its element list. 
+    """
+    # arrays from this size are transformed through numpy views when available
+    NUMPY_MIN_SIZE = 256
+
+    def __init__(self, xs=(), ys=()) -> None:
+        self.xs = array('d', xs)
+        self.ys = array('d', ys)
+        # frozen arrays are shared and refuse in-place transforms
+        self.frozen = False
+        if len(self.xs) != len(self.ys): 
+            raise ValueError(f"Vertex columns must have the same length, got {len(self.xs)} and {len(self.ys)}. ")
+
+    @staticmethod
+    def from_vectors(vertices: list): 
+        """Pack a list of 2D vectors or [x, y] lists"""
+        xs, ys = array('d'), array('d')
+        for vertex in vertices: 
+            vertex = Vector(vertex)
+            if vertex.dim != 2: 
+                raise ValueError(f"Input vertex dimension should be 2, got {vertex.dim}")
+            xs.append(vertex[0])
+            ys.append(vertex[1])
+        result = VertexArray()
+        result.xs, result.ys = xs, ys
+        return result
+
+    def copy(self): 
+        """Get a mutable copy"""
+        return VertexArray(self.xs, self.ys)
+
+    def freeze(self) -> None: 
+        self.frozen = True
+
+    def to_vectors(self) -> list[Vector]: 
+        return [Vec2(x, y).to_vector() for x, y in zip(self.xs, self.ys)]
+
+    def points(self): 
+        """Iterate over (x, y) tuples"""
+        return zip(self.xs, self.ys)
+
+    def bounds(self) -> tuple[float, float, float, float]: 
+        """Get (min x, max x, min y, max y), or None for an empty array"""
+        if not self.xs: 
+            return None
+        return min(self.xs), max(self.xs), min(self.ys), max(self.ys)
+
+    def transform(self, transform_matrix: Mat2, translation_vector: Vec2) -> None: 
+        """Apply x' = M x + t to every vertex in place"""
+        if self.frozen: 
+            raise ValueError("Cannot transform a frozen vertex array in place, transform a copy. ")
+        a, b, c, d = transform_matrix.a, transform_matrix.b, transform_matrix.c, transform_matrix.d
+        tx, ty = translation_vector.x, translation_vector.y
+        xs, ys = self.xs, self.ys
+        if np is not None and len(xs) >= VertexArray.NUMPY_MIN_SIZE: 
+            x, y = np.frombuffer(xs), np.frombuffer(ys)
+            x[:], y[:] = a * x + b * y + tx, c * x + d * y + ty
+            return
+        for i in range(len(xs)): 
+            x, y = xs[i], ys[i]
+            xs[i] = a * x + b * y + tx
+            ys[i] = c * x + d * y + ty
+
+    @staticmethod
+    def batch_transform(vertex_arrays: list, transform_matrix: Mat2, translation_vector: Vec2) -> None: 
+        """Apply the same transformation to many vertex arrays as one operation"""
+        vertex_arrays = list(vertex_arrays)
+        if any(vertex_array.frozen for vertex_array in vertex_arrays): 
+            raise ValueError("Cannot transform a frozen vertex array in place, transform a copy. ")
+        total = sum(len(vertex_array) for vertex_array in vertex_arrays)
+        if np is None or total < VertexArray.NUMPY_MIN_SIZE: 
+            for vertex_array in vertex_arrays: 
+                vertex_array.transform(transform_matrix, translation_vector)
+            return
+        # gather all columns, transform them in one expression and scatter back
+        a, b, c, d = transform_matrix.a, transform_matrix.b, transform_matrix.c, transform_matrix.d
+        tx, ty = translation_vector.x, translation_vector.y
+        x = np.concatenate([np.frombuffer(vertex_array.xs) for vertex_array in vertex_arrays if len(vertex_array)])
+        y = np.concatenate([np.frombuffer(vertex_array.ys) for vertex_array in vertex_arrays if len(vertex_array)])
+        x, y = a * x + b * y + tx, c * x + d * y + ty
+        start = 0
+        for vertex_array in vertex_arrays: 
+            stop = start + len(vertex_array)
+            if stop > start: 
+                np.frombuffer(vertex_array.xs)[:] = x[start:stop]
+                np.frombuffer(vertex_array.ys)[:] = y[start:stop]
+            start = stop
+
+    def __len__(self) -> int: 
+        return len(self.xs)
+
+    def __getitem__(self, index) -> Vector: 
+        return Vec2(self.xs[index], self.ys[index]).to_vector()
+
+    def __repr__(self) -> str: 
+        return f"VertexArray{[list(point) for point in self.points()]}"
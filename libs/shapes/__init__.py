@@ -1,3 +1,4 @@
 from .shape import Shape
 from .polygon import Polygon
-from .regular_polygon import RegularPolygon
\ No newline at end of file
+from .regular_polygon import RegularPolygon, UnitPolygonCache
+from .ellipse import Ellipse
\ No newline at end of file
@@ -0,0 +1,59 @@
+import math
+from . import Shape, Polygon
+from .regular_polygon import RegularPolygon, UnitPolygonCache
+from ..ops import Affine2D, VertexArray
+
+class Ellipse(Shape):
+    """
+    Axis-aligned ellipse in local space, with semi-axes rx and ry, centred at the origin. 
+    It is drawn by parametric stepping: the number of steps is taken from the on-screen size, 
+    so the cost follows the perimeter in pixels whatever the transformation. 
+    """
+    # largest distance in pixels between the curve and its steps
+    TOLERANCE = 0.05
+    # fewest steps, for very small ellipses
+    MIN_STEPS = 8
+    # unit circle steps, kept apart from the regular polygon tables and their statistics
+    unit_cache = UnitPolygonCache()
+
+    def __init__(self, rx: float, ry: float=None):
+        super().__init__()
+        ry = rx if ry is None else ry
+        if rx <= 0 or ry <= 0:
+            raise ValueError("Semi-axes must be positive.")
+        self.rx, self.ry = float(rx), float(ry)
+
+    def projected_radius(self) -> float: 
+        """Largest on-screen semi-axis, after scaling and rotation"""
+        t = self.transform
+        a, b, c, d = t.a * self.rx, t.b * self.ry, t.c * self.rx, t.d * self.ry
+        # largest singular value of [[a, b], [c, d]]
+        squares, determinant = a * a + b * b + c * c + d * d, a * d - b * c
+        return math.sqrt((squares + math.sqrt(max(0., squares * squares - 4 * determinant * determinant))) / 2)
+
+    def num_steps(self) -> int: 
+        return max(Ellipse.MIN_STEPS, RegularPolygon.chord_sides(self.projected_radius(), Ellipse.TOLERANCE))
+
+    @property
+    def vertex_array(self) -> VertexArray: 
+        """Screen-space steps"""
+        # unit circle steps, the semi-axes are folded into the transformation
+        t = self.transform
+        to_screen = Affine2D(t.a * self.rx, t.b * self.ry, t.c * self.rx, t.d * self.ry, t.tx, t.ty)
+        return to_screen.apply_array(Ellipse.unit_cache.get(self.num_steps()))
+
+    def outline(self) -> list[tuple[float, float]]:
+        return list(self.vertex_array.points())
+
+    def segments(self) -> list[tuple[float, float, float, float]]:
+        points = self.outline()
+        return [(*points[i - 1], *points[i]) for i in range(1, len(points))] + [(*points[-1], *points[0])]
+
+    def bake(self) -> Polygon: 
+        """Get the screen-space steps as a polygon"""
+        return Polygon(vertices=self.vertex_array, is_closed=True, fill=self.fill)
+
+    def draw(self, canvas, fill: str=None):
+        super().draw(canvas, fill)
+        self.bake().draw(canvas, fill)
+        return self
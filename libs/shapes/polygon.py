@@ -1,35 +1,80 @@
 from . import Shape
-from ..ops import Vector, Matrix
+from ..ops import Vector, Matrix, Affine2D, VertexArray
 
 class Polygon(Shape):
-    def __init__(self, vertices: list[list], is_closed:bool=True): 
+    def __init__(self, vertices: list[list], is_closed:bool=True, fill: str=None): 
         super().__init__()
+        self.fill = fill
 
-        self.vertices = []
-        # Check input point dimension
-        for vertex in vertices: 
-            if Vector(vertex).dim != 2: 
-                raise ValueError(f"Input vertex dimension should be 2, got {vertex.dim}")
-            self.vertices.append(Vector(vertex))
+        # Local geometry, packed; a VertexArray is taken over as it is and may be 
+        # shared between instances, so it is never modified in place
+        if isinstance(vertices, VertexArray): 
+            self.geometry = vertices
+        else: 
+            # Check input point dimension
+            self.geometry = VertexArray.from_vectors(vertices)
         self.is_closed = is_closed
 
+    @property
+    def vertex_array(self) -> VertexArray: 
+        """Screen-space vertices, the transformation applied once to every vertex"""
+        if self.transform.is_identity(): 
+            return self.geometry
+        return self.transform.apply_array(self.geometry)
+
+    @property
+    def vertices(self) -> tuple[Vector, ...]: 
+        """
+        Screen-space vertices as a read-only tuple of new Vector, computed on every access. 
+        Changing them does not change the polygon, assign a new list of vertices instead. 
+        """
+        return tuple(self.vertex_array.to_vectors())
+
+    @vertices.setter
+    def vertices(self, vertices: list) -> None: 
+        """Replace the geometry by the given screen-space vertices, resetting the transformation"""
+        self.geometry = VertexArray.from_vectors(vertices)
+        self.transform = Affine2D.identity()
+
+    def bake(self): 
+        """Get a polygon holding the screen-space vertices, with an identity transformation"""
+        return Polygon(vertices=self.vertex_array.copy(), is_closed=self.is_closed, fill=self.fill)
+
     def affine_transform(self, transform_matrix: Matrix, translation_vector: Vector): 
         try:
             super().affine_transform(transform_matrix, translation_vector)
         except Exception as e:
             print(e)
             return False
-        
-        for i in range(len(self.vertices)): 
-            self.vertices[i] = transform_matrix * self.vertices[i] + translation_vector
 
         return True
-    
-    def draw(self, canvas):
-        super().draw(canvas)
-        for i in range(len(self.vertices) - 1): 
-            canvas.draw_line(self.vertices[i], self.vertices[i + 1])
+
+    @staticmethod
+    def batch_affine_transform(polygons: list, transform_matrix: Matrix, translation_vector: Vector) -> None: 
+        """Apply the same affine transformation to many polygons at once"""
+        Shape.transform_check(transform_matrix, translation_vector)
+        transform = Affine2D.from_matrix(transform_matrix, translation_vector)
+        for polygon in polygons: 
+            polygon.apply_transform(transform)
+
+    def segments(self) -> list[tuple[float, float, float, float]]:
+        points = list(self.vertex_array.points())
+        if self.is_closed and points:
+            points.append(points[0])
+        return [(*points[i], *points[i + 1]) for i in range(len(points) - 1)]
+
+    def outline(self) -> list[tuple[float, float]]:
+        return list(self.vertex_array.points())
+
+    def draw(self, canvas, fill: str=None):
+        super().draw(canvas, fill)
+        vertices = self.vertices
+        for i in range(len(vertices) - 1): 
+            canvas.draw_line(vertices[i], vertices[i + 1])
         if self.is_closed: 
-            canvas.draw_line(self.vertices[-1], self.vertices[0])
+            canvas.draw_line(vertices[-1], vertices[0])
+        fill = self.fill if fill is None else fill
+        if fill is not None and vertices: 
+            canvas.fill_polygon(self.outline(), fill)
         
         return self
\ No newline at end of file
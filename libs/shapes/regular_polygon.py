@@ -1,19 +1,126 @@
 import math
+from collections import OrderedDict
 from . import Polygon
-from .. ops import Vector
+from .. ops import VertexArray
+
+class UnitPolygonCache:
+    """Bounded LRU cache of read-only unit regular polygon vertex tables, keyed by number of sides"""
+    def __init__(self, maxsize: int=256) -> None:
+        if not isinstance(maxsize, int) or maxsize <= 0: 
+            raise ValueError(f"Cache size should be an integer greater than zero, got {maxsize}. ")
+        self.maxsize = maxsize
+        self.tables = OrderedDict()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    @staticmethod
+    def unit_table(num_sides: int) -> VertexArray: 
+        """Calculate the vertices of a regular polygon with radius 1"""
+        table = VertexArray(
+            xs=[math.cos(2 * math.pi * i / num_sides) for i in range(num_sides)], 
+            ys=[math.sin(2 * math.pi * i / num_sides) for i in range(num_sides)]
+        )
+        table.freeze()
+        return table
+
+    def get(self, num_sides: int) -> VertexArray: 
+        table = self.tables.get(num_sides)
+        if table is not None: 
+            self.hits += 1
+            self.tables.move_to_end(num_sides)
+            return table
+        self.misses += 1
+        table = self.tables[num_sides] = UnitPolygonCache.unit_table(num_sides)
+        self.evict()
+        return table
+
+    def evict(self) -> None: 
+        # drop the least recently used tables
+        while len(self.tables) > self.maxsize: 
+            self.tables.popitem(last=False)
+            self.evictions += 1
+
+    def warm(self, side_counts) -> None: 
+        """Precompute the tables of the given side counts without counting hits or misses"""
+        for num_sides in side_counts: 
+            if num_sides not in self.tables: 
+                self.tables[num_sides] = UnitPolygonCache.unit_table(num_sides)
+        self.evict()
+
+    def resize(self, maxsize: int) -> None: 
+        if not isinstance(maxsize, int) or maxsize <= 0: 
+            raise ValueError(f"Cache size should be an integer greater than zero, got {maxsize}. ")
+        self.maxsize = maxsize
+        self.evict()
+
+    def clear(self) -> None: 
+        self.tables.clear()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def info(self) -> dict: 
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions, 
+            "size": len(self.tables), "maxsize": self.maxsize
+            }
+
+    def __contains__(self, num_sides: int) -> bool: 
+        return num_sides in self.tables
+
+    def __len__(self) -> int: 
+        return len(self.tables)
+
 
 class RegularPolygon(Polygon):
+    # unit vertex tables shared by every instance
+    unit_cache = UnitPolygonCache()
+    # polygons with at most this many sides keep their exact geometry under level of detail
+    LOD_MIN_SIDES = 16
+
     def __init__(self, num_sides, radius):
         if num_sides < 3:
             raise ValueError("A polygon must have at least 3 sides.")
         if radius <= 0:
             raise ValueError("Radius must be positive.")
 
-        # Calculate the vertices of reg polygon
-        vertices = [
-            Vector([radius * math.cos(2 * math.pi * i / num_sides), 
-             radius * math.sin(2 * math.pi * i / num_sides)])
-            for i in range(num_sides)
-        ]
+        if radius == 1: 
+            # shared read-only unit table
+            vertices = RegularPolygon.unit_cache.get(int(num_sides))
+        else: 
+            # Calculate the vertices of reg polygon straight into packed columns
+            vertices = VertexArray(
+                xs=[radius * math.cos(2 * math.pi * i / num_sides) for i in range(num_sides)], 
+                ys=[radius * math.sin(2 * math.pi * i / num_sides) for i in range(num_sides)]
+            )
         
-        super().__init__(vertices=vertices, is_closed=True)
\ No newline at end of file
+        super().__init__(vertices=vertices, is_closed=True)
+        self.num_sides = int(num_sides)
+
+    @staticmethod
+    def chord_sides(radius: float, tolerance: float=0.25) -> int: 
+        """Fewest sides whose edges stay within tolerance of a circle of the radius"""
+        if not tolerance > 0: 
+            raise ValueError(f"Tolerance should be greater than zero, got {tolerance}. ")
+        if radius <= tolerance: 
+            return 3
+        return max(3, math.ceil(math.pi / math.acos(1 - tolerance / radius)))
+
+    @staticmethod
+    def lod_sides(num_sides: int, radius: float, tolerance: float=0.25) -> int: 
+        """
+        Level of detail: the number of sides to draw for an on-screen radius in pixels. 
+        Sides beyond those needed to look round within tolerance are dropped, only from 
+        polygons with more than LOD_MIN_SIDES sides and never below it, so squares stay squares. 
+        """
+        if not tolerance > 0: 
+            raise ValueError(f"Tolerance should be greater than zero, got {tolerance}. ")
+        num_sides = int(num_sides)
+        if num_sides <= RegularPolygon.LOD_MIN_SIDES: 
+            return num_sides
+        return max(RegularPolygon.LOD_MIN_SIDES, min(num_sides, RegularPolygon.chord_sides(radius, tolerance)))
+
+    @staticmethod
+    def warm_cache(side_counts) -> None: 
+        RegularPolygon.unit_cache.warm(int(num_sides) for num_sides in side_counts)
+
+    @staticmethod
+    def cache_info() -> dict: 
+        return RegularPolygon.unit_cache.info()
\ No newline at end of file
@@ -1,19 +1,47 @@
-from ..ops import Vector, Matrix
+import copy
+from ..ops import Vector, Matrix, Affine2D
 class Shape:
     def __init__(self) -> None:
-        pass
+        # transformation from local geometry to screen, applied lazily at draw time
+        self.transform = Affine2D.identity()
+        # fill rule of the interior, "evenodd" or "nonzero", None for the outline only
+        self.fill = None
 
     def affine_transform(self, transform_matrix: Matrix, translation_vector: Vector): 
+        Shape.transform_check(transform_matrix, translation_vector)
+        self.apply_transform(Affine2D.from_matrix(transform_matrix, translation_vector))
+        return 
+
+    def apply_transform(self, transform: Affine2D) -> None: 
+        """Compose transform after the current one, the geometry itself is not touched"""
+        self.transform = transform if self.transform.is_identity() else transform * self.transform
+
+    def instance(self, transform: Affine2D=None): 
+        """Create a copy sharing the local geometry, with its own transformation"""
+        result = copy.copy(self)
+        result.transform = Affine2D.identity() if transform is None else transform
+        return result
+
+    @staticmethod
+    def transform_check(transform_matrix: Matrix, translation_vector: Vector) -> None: 
         if not isinstance(translation_vector, Vector): 
             raise TypeError(f"Translation vector should be a Vector, not {type(translation_vector)}")
 
         if not isinstance(transform_matrix, Matrix): 
             raise TypeError(f"Transformation matrix should be a Matrix, not {type(transform_matrix)}")
-        return 
 
-    def draw(self, canvas):
+    def segments(self) -> list[tuple[float, float, float, float]]:
+        """Get the outline as a flat table of (ax, ay, bx, by) segments"""
+        return []
+
+    def outline(self) -> list[tuple[float, float]]:
+        """Get the screen-space (x, y) points of the closed outline to fill"""
+        return []
+
+    def draw(self, canvas, fill: str=None):
         """
         Draw on buffer. 
         :param canvas: The buffer to draw. 
+        :param fill: Fill rule overriding the one of the shape. 
         """
         pass 
\ No newline at end of file
@@ -1,61 +1,226 @@
 import os
+import sys
+import time
+import asyncio
 import argparse
+import functools
 from datetime import datetime
 from libs import engine
 
 SCRIPT_DIRECTORY = "scripts"
 
-def create_exception_logger(log_to_file=False): 
+def create_exception_logger(log_to_file=False, filename=None, stream=None): 
     # create closure logging func
     logger = None
     if not log_to_file: 
-        # log to console
-        def logger_console(exception: str, traceback_details: str): 
-            print("Exception: " + exception)
-            print(traceback_details)
+        # log to console, stdout unless the output owns it
+        def logger_console(exception: str, traceback_details: engine.ErrorContext): 
+            print("Exception: " + exception, file=stream)
+            print(traceback_details, file=stream)
         return logger_console
     elif log_to_file: 
         # log to file
-        filename = datetime.now().strftime("%Y-%m-%d-%H-%M-%S") + ".log"
-        def logger_file(exception: str, traceback_details: str): 
+        if filename is None: 
+            filename = datetime.now().strftime("%Y-%m-%d-%H-%M-%S") + ".log"
+        # opened on the first error and kept open, written in batches until close()
+        writer = None
+        def logger_file(exception: str, traceback_details: engine.ErrorContext): 
+            nonlocal writer
             try: 
-                with open(filename, 'a') as file_handler: 
-                    file_handler.write("\nException: " + exception + "\n")
-                    file_handler.write(traceback_details)
+                if writer is None: 
+                    writer = engine.LogWriter(filename)
+                writer.write("\nException: " + exception + "\n" + str(traceback_details))
             except Exception as e: 
                 print(f"An error occur when logging to file")
+        def close() -> None: 
+            if writer is not None: 
+                writer.close()
+        logger_file.close = close
         return logger_file
 
+def create_diagnostics(filename: str, max_errors: int, with_traceback: bool): 
+    # bounded logger, records and batched writes to one open file
+    writer = engine.LogWriter(filename, background=filename != "-")
+    return engine.Diagnostics(max_errors=max_errors, writer=writer, with_traceback=with_traceback)
+
+def positive_float(text: str) -> float: 
+    # argparse type of the options that must be greater than zero
+    value = float(text)
+    if not value > 0: 
+        raise argparse.ArgumentTypeError(f"should be greater than zero, got {text}")
+    return value
+
+def frame_filename(output: str, index: int) -> str: 
+    # house.png -> house_0001.png
+    root, extension = os.path.splitext(output)
+    return f"{root}_{index:04d}{extension}"
+
+def render_animation(args, logger, script_path: str) -> None: 
+    # Load keyframed script
+    animation_loader = engine.AnimationLoader(filename=script_path, use_mmap=args.mmap)
+    animation_loader.read_animation(on_error=logger)
+    animation = engine.Animation.from_loader(animation_loader, backend=args.backend)
+    live = engine.LiveDisplay(fps=args.fps) if args.live and not args.output else None
+    # Render, static shapes are drawn once
+    for index, frame in animation.frames(args.frames): 
+        if args.output: 
+            engine.write_image(frame, frame_filename(args.output, index))
+        elif live is not None: 
+            # redraw in place, only the changed cells are sent
+            live.show(frame)
+        else: 
+            frame.display(mode='square')
+            print()
+    if live is not None: 
+        live.close()
+
+def render_script(args, logger, script_path: str, profiler, cache=None) -> None: 
+    script_loader = engine.ScriptLoader(filename=script_path, use_mmap=args.mmap, lod_tolerance=args.lod)
+    # cached scenes are already transformed, and may come with their frame
+    key = cache.loader_key(script_loader) if cache is not None else None
+
+    with profiler.stage("load"): 
+        if key is not None: 
+            shapes = cache.load_script(script_loader, on_error=logger, key=key)
+        else: 
+            # shapes are streamed, possible multiple exception are logged as they are met
+            shapes = script_loader.stream_shapes(on_error=logger)
+        height, width = script_loader.get_size()
+    # streamed shapes are loaded and transformed while they are drawn, their time is kept apart
+    if profiler.enabled: 
+        shapes = profiler.staged("load", shapes)
+
+    if args.canvas_file: 
+        # bit-packed canvas mapped from a file, rendered strip by strip
+        buffer = engine.PackedBuffer(height=height, width=width, filename=args.canvas_file)
+    else: 
+        buffer = engine.Buffer.create(height=height, width=width, backend=args.backend)
+    # Draw frame to buffer in a single pass over the scene
+    with profiler.stage("rasterize"): 
+        if key is None or not cache.load_frame(key, buffer): 
+            if args.workers > 1: 
+                renderer = engine.ParallelRenderer(workers=args.workers)
+                renderer.render(buffer, shapes)
+                profiler.counters.update(renderer.counts)
+            else: 
+                buffer.render(shapes)
+            if key is not None: 
+                cache.store_frame(key, buffer)
+    if profiler.enabled: 
+        profiler.counters.update(buffer.clip_counts)
+    # Save or display
+    with profiler.stage("output"): 
+        if args.output: 
+            engine.write_image(buffer, args.output)
+        else: 
+            buffer.display(mode='shade' if buffer.max_value > 1 else 'square')
+    if args.canvas_file: 
+        buffer.close()
+
+def render_stream(args, logger, profiler) -> None: 
+    if args.stream == "-": 
+        lines = engine.stdin_lines()
+    else: 
+        host, _, port = args.stream.rpartition(":")
+        lines = engine.socket_lines(host or "127.0.0.1", int(port))
+    renderer = engine.StreamRenderer(on_error=logger, backend=args.backend)
+    # row bands go to stdout while the input is still arriving
+    buffer = asyncio.run(renderer.run(lines, engine.stream_writer()))
+    if buffer is not None and args.output: 
+        engine.write_image(buffer, args.output)
+    if profiler.enabled: 
+        profiler.counters.update(renderer.counts)
+        if renderer.first_band is not None: 
+            profiler.stages["first band"] = {"wall": renderer.first_band, "cpu": 0.}
+
+def render_batch(args) -> None: 
+    script_paths = engine.collect_scripts(args.batch)
+    # one log per script, the factory is called in the workers with the log path
+    if args.diagnostics is not None: 
+        logger_factory = functools.partial(create_diagnostics, max_errors=args.max_errors, with_traceback=args.tracebacks)
+    else: 
+        logger_factory = functools.partial(create_exception_logger, True)
+    batch_renderer = engine.BatchRenderer(
+        jobs=args.jobs, logger_factory=logger_factory, 
+        output_format=args.format, backend=args.backend, 
+        cache_dir=args.cache, cache_bytes=args.cache_size << 20
+    )
+    start = time.perf_counter()
+    results = []
+    # report each script as it completes
+    for result in batch_renderer.run(script_paths, output_dir=args.output_dir): 
+        results.append(result)
+        status = "ok" if result["ok"] else "FAILED"
+        print(f"[{len(results)}/{len(script_paths)}] {status} {result['script']} ({result['errors']} errors, {result['seconds'] * 1e3:.1f}ms)")
+    print(engine.BatchRenderer.summarize(results, time.perf_counter() - start))
+
 def main() -> None: 
     # Parse user input
     parser = argparse.ArgumentParser()
-    parser.add_argument("script", type=str, help="Type in your script filename. ")
+    parser.add_argument("script", type=str, nargs='?', default=None, help="Type in your script filename. ")
     parser.add_argument("-l", "--filelogger", action='store_true', help="Create logger file. ")
+    parser.add_argument("-m", "--mmap", action='store_true', help="Read the script through mmap. ")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Rasterize in parallel on N processes. ")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Write the frame to a .png, .pgm, .pbm or .txt file instead of displaying it. ")
+    parser.add_argument("-f", "--frames", type=int, default=0, help="Render N frames of a keyframed script. ")
+    parser.add_argument("-b", "--backend", type=str, default="auto", choices=engine.Buffer.BACKENDS, help="Pixel storage backend. ")
+    parser.add_argument("-p", "--profile", action="store_const", const='-', default=None, help="Print stage timings and counters to stderr. ")
+    parser.add_argument("--profile-json", type=str, dest="profile", default=None, help="Write stage timings and counters as JSON to the given file. ")
+    parser.add_argument("--cprofile", type=str, default=None, help="Run under cProfile and dump the stats to the given file. ")
+    parser.add_argument("--tracemalloc", type=int, default=0, help="Trace allocations and print the N top sites. ")
+    parser.add_argument("--batch", type=str, default=None, help="Render every script of a directory, glob pattern or manifest file. ")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes of the batch mode. ")
+    parser.add_argument("--output-dir", type=str, default="renders", help="Output and log directory of the batch mode. ")
+    parser.add_argument("--canvas-file", type=str, default=None, help="Keep the frame bit-packed in a memory-mapped file, for canvases larger than memory. ")
+    parser.add_argument("--live", action='store_true', help="Redraw animation frames in place, sending only the changed cells. ")
+    parser.add_argument("--fps", type=float, default=30., help="Frame rate cap of the live display. ")
+    parser.add_argument("--lod", type=positive_float, default=None, help="Drop the sides of regular polygons that change the outline by less than the given pixels. ")
+    parser.add_argument("--cache", type=str, default=None, help="Cache loaded scenes and frames in the given directory. ")
+    parser.add_argument("--cache-size", type=int, default=64, help="Size limit of the cache directory in MB. ")
+    parser.add_argument("--stream", type=str, default=None, help="Render shape lines as they arrive on stdin (-) or on a local HOST:PORT socket, printing row bands. ")
+    parser.add_argument("--diagnostics", type=str, default=None, help="Log typed error records to the given file (- for stderr), in batches from a background writer. With --batch, to the log of each script. ")
+    parser.add_argument("--max-errors", type=int, default=100, help="Errors recorded by --diagnostics before only counting them. ")
+    parser.add_argument("--tracebacks", action='store_true', help="Include tracebacks in the --diagnostics log. ")
+    parser.add_argument("--format", type=str, default="png", choices=["png", "pgm", "pbm", "txt"], help="Output format of the batch mode. ")
     
     args = parser.parse_args()
+    if args.batch is not None: 
+        try: 
+            render_batch(args)
+        except ValueError as e: 
+            # invalid batches, such as two scripts rendering to the same output, are rejected before any render
+            parser.error(str(e))
+        return
+    if args.script is None and args.stream is None: 
+        parser.error("a script filename is required unless --batch or --stream is given")
 
     # initiate logger
-    logger = create_exception_logger(args.filelogger)
+    if args.diagnostics is not None: 
+        logger = create_diagnostics(args.diagnostics, args.max_errors, args.tracebacks)
+    else: 
+        # stdout carries the row bands in stream mode
+        logger = create_exception_logger(args.filelogger, stream=sys.stderr if args.stream is not None else None)
+    profiler = engine.Profiler(enabled=args.profile is not None)
 
     # Load script from file
-    script_path = os.path.join(SCRIPT_DIRECTORY, args.script)
-    script_loader = engine.ScriptLoader(filename=script_path)
-
-    # possible multiple exception
-    exceptions, traceback_details = script_loader.read_script()
-    for exception, traceback_detail in list(zip(exceptions, traceback_details)):
-        logger(exception, traceback_detail)
-
-    height, width = script_loader.get_size()
-    shapes = script_loader.get_shapes()
-
-    buffer = engine.Buffer(height=height, width=width)
-    # Draw frame to buffer
-    for shape in shapes: 
-        shape.draw(canvas=buffer)
-    # Display 
-    buffer.display(mode='square')
-
+    script_path = os.path.join(SCRIPT_DIRECTORY, args.script) if args.script is not None else None
+    if args.stream is not None: 
+        run = lambda: render_stream(args, logger, profiler)
+    elif args.frames > 0: 
+        run = lambda: render_animation(args, logger, script_path)
+    else: 
+        cache = engine.SceneCache(args.cache, max_bytes=args.cache_size << 20) if args.cache else None
+        run = lambda: render_script(args, logger, script_path, profiler, cache)
+    try: 
+        with profiler: 
+            engine.run_with_hooks(run, cprofile_path=args.cprofile, tracemalloc_top=args.tracemalloc)
+    finally: 
+        if hasattr(logger, "close"): 
+            logger.close()
+        if args.diagnostics not in (None, "-"): 
+            print(logger.summary(), end="", file=sys.stderr)
+    if profiler.enabled: 
+        profiler.dump(args.profile)
 
 
 if __name__ == '__main__': 
@@ -0,0 +1,30 @@
+from libs import engine
+
+
+def read(tmp_path, text):
+    script = tmp_path / "anim.txt"
+    script.write_text(text)
+    errors = []
+    loader = engine.AnimationLoader(str(script))
+    tracks = loader.read_animation(on_error=lambda exception, details: errors.append(details))
+    return tracks, errors
+
+
+def test_keyframes_of_rejected_shape_are_not_attached(tmp_path):
+    tracks, errors = read(tmp_path, "32 32\n4 5 5 0 10 10\n4 5 x 0 20 20\n@ 10 5 5 90 20 20\n@ 20 5 5 180 20 20\n")
+    assert len(tracks) == 1
+    assert tracks[0].is_static()
+    assert [(error.line, error.code) for error in errors] == [(3, "bad-line"), (4, "bad-keyframe"), (5, "bad-keyframe")]
+
+
+def test_keyframes_attach_again_after_next_valid_shape(tmp_path):
+    tracks, errors = read(tmp_path, "32 32\n4 5 x 0 20 20\n@ 10 5 5 90 20 20\n4 5 5 0 10 10\n@ 10 5 5 90 10 10\n")
+    assert len(tracks) == 1
+    assert sorted(tracks[0].keyframes) == [0, 10]
+    assert [error.code for error in errors] == ["bad-line", "bad-keyframe"]
+
+
+def test_keyframe_before_any_shape(tmp_path):
+    tracks, errors = read(tmp_path, "32 32\n@ 10 5 5 90 20 20\n")
+    assert tracks == []
+    assert [error.code for error in errors] == ["bad-keyframe"]
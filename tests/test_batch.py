@@ -0,0 +1,50 @@
+import pytest
+
+from libs import engine
+
+SCRIPT = "24 32\n3 8 8 0 12 16\n"
+
+
+def discard(log_path):
+    return lambda exception, traceback_details: None
+
+
+def renderer():
+    return engine.BatchRenderer(jobs=1, logger_factory=discard, output_format="txt")
+
+
+def test_scripts_of_the_same_name_render_apart(tmp_path):
+    for directory, sides in (("a", 3), ("b", 4)):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "scene.txt").write_text(f"24 32\n{sides} 8 8 0 12 16\n")
+    scripts = engine.collect_scripts(str(tmp_path / "*" / "scene.txt"))
+    output_dir = tmp_path / "renders"
+    results = list(renderer().run(scripts, str(output_dir)))
+    assert all(result["ok"] for result in results)
+    assert sorted(str(path.relative_to(output_dir)) for path in output_dir.rglob("*.txt")) == ["a/scene.txt", "b/scene.txt"]
+    assert (output_dir / "a" / "scene.txt").read_text() != (output_dir / "b" / "scene.txt").read_text()
+
+
+def test_scripts_of_one_directory_keep_their_names(tmp_path):
+    (tmp_path / "scene.txt").write_text(SCRIPT)
+    assert renderer().plan([str(tmp_path / "scene.txt")], "renders") == [
+        (str(tmp_path / "scene.txt"), "renders/scene.txt", "renders/scene.log")]
+
+
+def test_colliding_outputs_are_rejected(tmp_path):
+    (tmp_path / "scene.txt").write_text(SCRIPT)
+    (tmp_path / "scene.dat").write_text(SCRIPT)
+    with pytest.raises(ValueError):
+        renderer().plan([str(tmp_path / "scene.txt"), str(tmp_path / "scene.dat")], "renders")
+
+
+def test_keyframed_script_renders_its_first_frame(tmp_path):
+    script = tmp_path / "spin.txt"
+    script.write_text("24 32\n4 6 6 0 12 10\n@ 10 6 6 90 12 22\n")
+    output_dir = tmp_path / "renders"
+    (result,) = renderer().run([str(script)], str(output_dir))
+    assert result["ok"] and result["errors"] == 0
+    loader = engine.AnimationLoader(str(script))
+    loader.read_animation()
+    frame = engine.Animation.from_loader(loader).frame(0)
+    assert (output_dir / "spin.txt").read_text() == engine.encode(frame, ".txt").decode()
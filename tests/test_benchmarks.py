@@ -0,0 +1,12 @@
+from benchmarks import runner
+
+
+def results(**medians):
+    return {"results": {case: {"median": median} for case, median in medians.items()}}
+
+
+def test_missing_cases_are_reported():
+    baseline, current = results(a=0.01, b=0.02), results(a=0.012, c=0.03)
+    assert runner.compare(baseline, current) == [("a", 0.01, 0.012, 1.2, True)]
+    assert runner.missing(baseline, current) == ["b"]
+    assert runner.missing(baseline, baseline) == []
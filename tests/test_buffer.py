@@ -0,0 +1,25 @@
+import pytest
+
+from libs import engine
+from libs.ops import Vector
+from tests.test_packed_buffer import scene
+
+
+@pytest.mark.parametrize("threshold", [0.5, 1.0, 2.25])
+def test_bbox_segment_matches_exact(threshold):
+    for ax, ay, bx, by in [(3, 2, 20, 17), (12.5, 0.25, 12.5, 30), (5, 5, 5, 5), (-4, -3, 30, 40), (18.2, 7.7, 2.1, 25.9)]:
+        exact = engine.Buffer(height=24, width=20, rasterizer="exact")
+        exact.draw_line(Vector([ax, ay]), Vector([bx, by]), threshold)
+        bbox = engine.Buffer(height=24, width=20)
+        bbox.draw_line(Vector([ax, ay]), Vector([bx, by]), threshold)
+        assert bbox.to_bytes() == exact.to_bytes()
+
+
+def test_bbox_render_matches_exact_render():
+    shapes = scene(24, 20, count=12)
+    exact = engine.Buffer(height=24, width=20, rasterizer="exact")
+    exact.render(shapes)
+    bbox = engine.Buffer(height=24, width=20)
+    bbox.render(shapes)
+    assert bbox.to_bytes() == exact.to_bytes()
+    assert any(bbox.to_bytes())
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from libs import engine
+from libs.engine.clipping import clip_segment, inside
+from libs.ops import Vector
+
+
+def test_clip_segment_keeps_the_inside_part():
+    rng = random.Random(4)
+    rect = (0., 10., -5., 5.)
+    for _ in range(500):
+        ax, ay, bx, by = (rng.uniform(-20, 30) for _ in range(4))
+        clipped = clip_segment(ax, ay, bx, by, rect)
+        samples = [(ax + t / 200 * (bx - ax), ay + t / 200 * (by - ay)) for t in range(201)]
+        if clipped is None:
+            assert not any(inside(x, y, rect) for x, y in samples)
+            continue
+        cx0, cy0, cx1, cy1 = clipped
+        for x, y in ((cx0, cy0), (cx1, cy1)):
+            assert inside(x, y, (rect[0] - 1e-9, rect[1] + 1e-9, rect[2] - 1e-9, rect[3] + 1e-9))
+            # on the original segment
+            assert abs((bx - ax) * (y - ay) - (by - ay) * (x - ax)) < 1e-6 * (1 + abs(bx - ax) + abs(by - ay)) ** 2
+
+
+@pytest.mark.parametrize("threshold", [0.5, 1.75])
+def test_clipped_segments_match_exact(threshold):
+    rng = random.Random(9)
+    for _ in range(30):
+        # long segments reaching far outside the canvas
+        ax, ay, bx, by = (rng.uniform(-200, 220) for _ in range(4))
+        exact = engine.Buffer(height=20, width=16, rasterizer="exact")
+        exact.draw_line(Vector([ax, ay]), Vector([bx, by]), threshold)
+        clipped = engine.Buffer(height=20, width=16)
+        clipped.draw_line(Vector([ax, ay]), Vector([bx, by]), threshold)
+        assert clipped.to_bytes() == exact.to_bytes()
+
+
+def test_culling_leaves_pixels_unchanged():
+    rng = random.Random(6)
+    shapes = [engine.ScriptLoader.build_shape([rng.randint(3, 7), rng.uniform(2, 30), rng.uniform(2, 30),
+                                               rng.uniform(0, 360), rng.uniform(-80, 100), rng.uniform(-80, 100)])
+              for _ in range(25)]
+    exact = engine.Buffer(height=20, width=16, rasterizer="exact")
+    exact.render(shapes)
+    culled = engine.Buffer(height=20, width=16)
+    culled.render(shapes)
+    assert culled.to_bytes() == exact.to_bytes()
+    assert culled.clip_counts["shapes culled"] > 0
+    assert culled.clip_counts["segments clipped"] > 0
@@ -0,0 +1,33 @@
+import functools
+
+from libs import engine
+from libs.engine.batch import render_one
+
+
+def diagnostics_factory(log_path, max_errors):
+    return engine.Diagnostics(max_errors=max_errors, writer=engine.LogWriter(log_path, batch_size=4, background=True))
+
+
+def test_error_cap_counts_overflow(tmp_path):
+    writer = engine.LogWriter(str(tmp_path / "errors.log"), batch_size=2)
+    diagnostics = engine.Diagnostics(max_errors=2, writer=writer)
+    for line in range(1, 6):
+        diagnostics("bad", engine.ErrorContext(line=line, code="bad-line"))
+    diagnostics.close()
+    assert [record.line for record in diagnostics.records] == [1, 2]
+    assert len(diagnostics) == 5 and diagnostics.overflow["bad-line"] == 3
+    text = (tmp_path / "errors.log").read_text()
+    assert text.startswith("line 1 [bad-line] bad\nline 2 [bad-line] bad\n")
+    assert "3 not logged past the cap of 2" in text
+
+
+def test_batch_worker_logs_through_factory(tmp_path):
+    script = tmp_path / "bad.txt"
+    script.write_text("10 10\n" + "1 2 x\n" * 50 + "4 2 2 0 5 5\n")
+    log_path = tmp_path / "bad.log"
+    result = render_one(str(script), str(tmp_path / "bad.txt.png"), str(log_path),
+                        functools.partial(diagnostics_factory, max_errors=3))
+    assert result["ok"] and result["errors"] == 50
+    lines = log_path.read_text().splitlines()
+    assert lines[0] == "line 2 [bad-line] Error in reading script: Invalid script in line 2: incorrect number of parameters. "
+    assert lines[3:] == ["50 script errors (bad-line: 50)", "47 not logged past the cap of 3"]
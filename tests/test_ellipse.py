@@ -0,0 +1,14 @@
+from libs.shapes import Ellipse, RegularPolygon
+from libs.ops import Matrix, Vector
+
+
+def test_ellipse_steps_do_not_touch_polygon_cache():
+    RegularPolygon.unit_cache.clear()
+    Ellipse.unit_cache.clear()
+    ellipse = Ellipse(3, 2)
+    ellipse.affine_transform(Matrix([[4, 0], [0, 4]]), Vector([20, 20]))
+    ellipse.segments()
+    ellipse.segments()
+    assert RegularPolygon.cache_info()["hits"] == RegularPolygon.cache_info()["misses"] == 0
+    assert len(RegularPolygon.unit_cache) == 0
+    assert Ellipse.unit_cache.info()["misses"] == 1 and Ellipse.unit_cache.info()["hits"] == 1
@@ -0,0 +1,68 @@
+import io
+import re
+
+from libs import engine
+from libs.engine.writers import encode_text
+
+ESCAPE = re.compile(r"\x1b\[(\?25[hl]|H|2J|(\d+);(\d+)H)")
+
+
+class Terminal:
+    """Screen of characters driven by the escape sequences LiveDisplay writes"""
+    def __init__(self):
+        self.cells = {}
+        self.row, self.col = 1, 1
+
+    def feed(self, text):
+        position = 0
+        for match in ESCAPE.finditer(text):
+            self.put(text[position:match.start()])
+            position = match.end()
+            if match.group(1) == "2J":
+                self.cells = {}
+            elif match.group(1) == "H":
+                self.row, self.col = 1, 1
+            elif match.group(2):
+                self.row, self.col = int(match.group(2)), int(match.group(3))
+        self.put(text[position:])
+
+    def put(self, text):
+        for char in text:
+            self.cells[self.row, self.col] = char
+            self.col += 1
+
+    def lines(self, height, width):
+        return "".join("".join(self.cells.get((row, col), " ") for col in range(1, 2 * width)) + "\n"
+                       for row in range(1, height + 1))
+
+
+def frames():
+    shapes = [engine.ScriptLoader.build_shape([4, 6, 6, angle, 14, 12 + angle / 15]) for angle in range(0, 180, 15)]
+    for shape in shapes:
+        buffer = engine.Buffer(height=24, width=30)
+        buffer.render([shape, engine.ScriptLoader.build_shape([3, 4, 4, 0, 5, 5])])
+        yield buffer
+
+
+def test_diffs_rebuild_every_frame():
+    stream, terminal = io.StringIO(), Terminal()
+    sizes = iter([(80, 24)] * 5 + [(100, 30)] * 20)
+    display = engine.LiveDisplay(stream=stream, fps=1e6, terminal_size=lambda: next(sizes))
+    written = []
+    for buffer in frames():
+        start = stream.tell()
+        display.show(buffer)
+        terminal.feed(stream.getvalue()[start:])
+        written.append(stream.tell() - start)
+        assert terminal.lines(24, 30) == encode_text(buffer, mode="square")
+    # the first frame and the resized one are repainted, the others only send changes
+    assert display.repaints == 2
+    assert max(written[1:5]) < written[0]
+
+
+def test_unchanged_frame_sends_only_the_cursor_park():
+    stream = io.StringIO()
+    display = engine.LiveDisplay(stream=stream, fps=1e6, terminal_size=lambda: (80, 24))
+    buffer = next(frames())
+    display.show(buffer)
+    assert display.show(buffer) == len("\x1b[25;1H")
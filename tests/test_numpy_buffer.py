@@ -0,0 +1,27 @@
+import pytest
+
+from libs import engine
+from libs.ops import Vector
+from tests.test_packed_buffer import scene
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("rasterizer", ["bbox", "exact"])
+def test_numpy_render_is_bit_identical(rasterizer):
+    shapes = scene(24, 20, count=12)
+    reference = engine.Buffer(height=24, width=20, rasterizer=rasterizer)
+    reference.render(shapes)
+    vectorized = engine.NumpyBuffer(height=24, width=20, rasterizer=rasterizer)
+    vectorized.render(shapes)
+    assert vectorized.to_bytes() == reference.to_bytes()
+
+
+def test_numpy_segments_match_scalar_distance():
+    for threshold in (0.5, 1.5):
+        for ax, ay, bx, by in [(0.3, 0.7, 17.9, 11.1), (9, 9, 9, 9), (-5, 3, 50, 3), (4, 30, 20, -8)]:
+            reference = engine.Buffer(height=24, width=20)
+            reference.draw_line(Vector([ax, ay]), Vector([bx, by]), threshold)
+            vectorized = engine.NumpyBuffer(height=24, width=20)
+            vectorized.draw_line(Vector([ax, ay]), Vector([bx, by]), threshold)
+            assert vectorized.to_bytes() == reference.to_bytes()
@@ -0,0 +1,28 @@
+import random
+
+from libs import engine
+
+
+def scene(height, width, count=40, seed=3):
+    rng = random.Random(seed)
+    shapes = []
+    for _ in range(count):
+        # some shapes cross the edges or lie outside the canvas
+        shapes.append(engine.ScriptLoader.build_shape([rng.randint(3, 8), rng.uniform(2, 12), rng.uniform(2, 12),
+                                                       rng.uniform(0, 360), rng.uniform(-20, height + 20),
+                                                       rng.uniform(-20, width + 20)]))
+    return shapes
+
+
+def test_strip_render_matches_and_counts_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine.PackedBuffer, "STRIP_ROWS", 16)
+    height, width = 48, 40
+    shapes = scene(height, width)
+    reference = engine.Buffer(height=height, width=width)
+    reference.render(shapes)
+    packed = engine.PackedBuffer(height=height, width=width, filename=str(tmp_path / "canvas.bin"))
+    packed.render(shapes)
+    assert packed.to_bytes() == reference.to_bytes()
+    assert packed.clip_counts == reference.clip_counts
+    assert reference.clip_counts["segments clipped"] > 0
+    packed.close()
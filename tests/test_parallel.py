@@ -0,0 +1,16 @@
+import pytest
+
+from libs import engine
+from tests.test_packed_buffer import scene
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "packed", "coverage"])
+def test_parallel_render_is_bit_identical(backend):
+    shapes = scene(48, 40)
+    # a filled shape as well, drawn after the bands are merged
+    shapes.append(engine.ScriptLoader.build_shape([6, 10, 10, 0, 24, 20, 1]))
+    serial = engine.Buffer.create(height=48, width=40, backend=backend)
+    serial.render(shapes)
+    parallel = engine.Buffer.create(height=48, width=40, backend=backend)
+    engine.ParallelRenderer(workers=2).render(parallel, shapes)
+    assert parallel.to_bytes() == serial.to_bytes()
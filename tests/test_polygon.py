@@ -0,0 +1,23 @@
+import pytest
+
+from libs.shapes import Polygon
+from libs.ops import Matrix, Vector
+
+
+def test_vertices_are_read_only():
+    polygon = Polygon([[0, 0], [4, 0], [0, 4]])
+    vertices = polygon.vertices
+    assert isinstance(vertices, tuple)
+    with pytest.raises(TypeError):
+        vertices[0] = Vector([1, 1])
+    with pytest.raises(AttributeError):
+        vertices.append(Vector([1, 1]))
+
+
+def test_vertices_setter_replaces_geometry():
+    polygon = Polygon([[0, 0], [4, 0], [0, 4]])
+    polygon.affine_transform(Matrix([[2, 0], [0, 2]]), Vector([1, 1]))
+    assert [v.data for v in polygon.vertices] == [[1, 1], [9, 1], [1, 9]]
+    polygon.vertices = [*polygon.vertices, Vector([5, 5])]
+    assert polygon.transform.is_identity()
+    assert [v.data for v in polygon.vertices] == [[1, 1], [9, 1], [1, 9], [5, 5]]
@@ -0,0 +1,61 @@
+import pytest
+
+from libs import engine
+from tests.test_packed_buffer import scene
+
+KEYS = ("segments drawn", "pixels tested", "pixels set")
+
+
+def counted(render):
+    profiler = engine.Profiler(enabled=True)
+    with profiler:
+        render()
+    return {key: profiler.counters[key] for key in KEYS}
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "packed", "coverage"])
+def test_every_backend_is_instrumented(backend):
+    shapes = scene(48, 40)
+    buffer = engine.Buffer.create(height=48, width=40, backend=backend)
+    counts = counted(lambda: buffer.render(shapes))
+    assert all(counts[key] > 0 for key in KEYS)
+
+
+def test_strip_counts_match_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine.PackedBuffer, "STRIP_ROWS", 16)
+    shapes = scene(48, 40)
+    serial = counted(lambda: engine.Buffer(height=48, width=40).render(shapes))
+    packed = engine.PackedBuffer(height=48, width=40, filename=str(tmp_path / "canvas.bin"))
+    strips = counted(lambda: packed.render(shapes))
+    packed.close()
+    assert strips["pixels tested"] == serial["pixels tested"]
+    assert strips["pixels set"] == serial["pixels set"]
+    # only segments with a pixel window reach the strips
+    assert 0 < strips["segments drawn"] <= serial["segments drawn"]
+
+
+def test_parallel_counts_match_serial():
+    shapes = scene(48, 40)
+    serial = counted(lambda: engine.Buffer(height=48, width=40).render(shapes))
+    renderer = engine.ParallelRenderer(workers=2)
+    renderer.render(engine.Buffer(height=48, width=40), shapes)
+    assert {key: renderer.counts[key] for key in KEYS} == serial
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "packed"])
+def test_pixels_set_match_the_frame(backend):
+    shapes = scene(48, 40)
+    buffer = engine.Buffer.create(height=48, width=40, backend=backend)
+    counts = counted(lambda: buffer.render(shapes))
+    assert counts["pixels set"] == engine.Profiler.count_set(buffer)
+
+
+def test_streamed_stages_are_timed_apart():
+    profiler = engine.Profiler(enabled=True)
+    shapes = profiler.staged("load", scene(48, 40))
+    with profiler:
+        with profiler.stage("rasterize"):
+            engine.Buffer(height=48, width=40).render(shapes)
+    assert set(profiler.stages) == {"load", "transform", "rasterize"}
+    total = sum(timing["wall"] for timing in profiler.stages.values())
+    assert profiler.stages["rasterize"]["wall"] < total
@@ -0,0 +1,40 @@
+import pytest
+
+from libs import engine
+from libs.shapes import RegularPolygon
+
+
+def test_lod_keeps_low_sided_polygons():
+    for num_sides in (3, 4, 6, 16):
+        assert RegularPolygon.lod_sides(num_sides, 1, 0.25) == num_sides
+    shape = engine.ScriptLoader.build_shape([4, 1, 1, 0, 5, 5], lod_tolerance=0.25)
+    assert shape.num_sides == 4 and len(shape.outline()) == 4
+
+
+def test_lod_never_drops_below_floor():
+    assert RegularPolygon.lod_sides(720, 0.5, 0.25) == RegularPolygon.LOD_MIN_SIDES
+    assert RegularPolygon.lod_sides(24, 1000, 0.25) == 24
+
+
+def test_lod_example_keeps_the_pixels():
+    # the example of the README: a 720-sided polygon of radius 10 at --lod 0.01
+    assert RegularPolygon.lod_sides(720, 10, 0.01) == 71
+    frames = []
+    for tolerance in (None, 0.01):
+        shape = engine.ScriptLoader.build_shape([720, 10, 10, 0, 16, 16], lod_tolerance=tolerance)
+        buffer = engine.Buffer(height=32, width=32)
+        buffer.render([shape])
+        frames.append((len(shape.outline()), buffer.to_bytes()))
+    (full_sides, full), (lod_sides, lod) = frames
+    assert (full_sides, lod_sides) == (720, 71)
+    assert lod == full and any(full)
+
+
+@pytest.mark.parametrize("tolerance", [0, -0.5, float("nan")])
+def test_lod_rejects_non_positive_tolerance(tolerance):
+    with pytest.raises(ValueError):
+        RegularPolygon.lod_sides(720, 10, tolerance)
+    with pytest.raises(ValueError):
+        RegularPolygon.chord_sides(10, tolerance)
+    with pytest.raises(ValueError):
+        engine.ScriptLoader("scene.txt", lod_tolerance=tolerance)
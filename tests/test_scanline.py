@@ -0,0 +1,68 @@
+import math
+import random
+
+import pytest
+
+from libs import engine
+from libs.engine.scanline import polygon_spans
+
+
+def brute_force(points, height, width, rule):
+    """Pixels whose centre is inside, from the crossings of each row taken one pixel at a time"""
+    inside = set()
+    for i in range(height):
+        x = height - i
+        crossings = []
+        for k in range(len(points)):
+            (x0, y0), (x1, y1) = points[k], points[(k + 1) % len(points)]
+            if x0 != x1 and min(x0, x1) <= x < max(x0, x1):
+                crossings.append((y0 + (x - x0) * ((y1 - y0) / (x1 - x0)), 1 if x1 > x0 else -1))
+        for j in range(width):
+            winding = sum(direction for y, direction in crossings if y <= j)
+            count = sum(1 for y, _ in crossings if y <= j)
+            if (count % 2 if rule == "evenodd" else winding != 0):
+                inside.add((i, j))
+    return inside
+
+
+def star(cx, cy, radius, points=5, step=2):
+    return [(cx + radius * math.cos(2 * math.pi * k * step / points), cy + radius * math.sin(2 * math.pi * k * step / points))
+            for k in range(points)]
+
+
+@pytest.mark.parametrize("rule", ["evenodd", "nonzero"])
+def test_spans_match_brute_force(rule):
+    rng = random.Random(2)
+    polygons = [star(20, 18, 15), [(2, 2), (30, 2), (30, 30), (2, 30)], [(5, 5), (5, 5), (5, 5)]]
+    polygons += [[(rng.uniform(-5, 45), rng.uniform(-5, 40)) for _ in range(rng.randint(3, 9))] for _ in range(20)]
+    for points in polygons:
+        spans = [(i, j) for i, j_lo, j_hi in polygon_spans(points, 40, 36, rule) for j in range(j_lo, j_hi + 1)]
+        assert len(spans) == len(set(spans))
+        assert set(spans) == brute_force(points, 40, 36, rule)
+
+
+def test_rules_differ_on_a_star():
+    points = star(20, 18, 15)
+    evenodd = brute_force(points, 40, 36, "evenodd")
+    nonzero = brute_force(points, 40, 36, "nonzero")
+    # the centre pentagon is a hole only under even-odd
+    assert (40 - 20, 18) in nonzero and (40 - 20, 18) not in evenodd
+    assert evenodd < nonzero
+
+
+def test_region_restricts_spans():
+    points = star(20, 18, 15)
+    region = (5, 20, 10, 25)
+    whole = {(i, j) for i, j_lo, j_hi in polygon_spans(points, 40, 36, "nonzero") for j in range(j_lo, j_hi + 1)}
+    part = {(i, j) for i, j_lo, j_hi in polygon_spans(points, 40, 36, "nonzero", region) for j in range(j_lo, j_hi + 1)}
+    assert part == {(i, j) for i, j in whole if 5 <= i <= 20 and 10 <= j <= 25}
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "packed", "coverage"])
+def test_filled_render_on_every_backend(backend):
+    shape = engine.ScriptLoader.build_shape([6, 12, 12, 0, 20, 18, 2])
+    buffer = engine.Buffer.create(height=40, width=36, backend=backend)
+    buffer.render([shape])
+    pixels = buffer.to_bytes()
+    filled = brute_force(shape.outline(), 40, 36, "nonzero")
+    assert all(pixels[i * 36 + j] == buffer.max_value for i, j in filled)
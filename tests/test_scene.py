@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from libs import engine
+from libs.ops import Affine2D, Matrix, Vector
+from tests.test_packed_buffer import scene
+
+
+def full_render(height, width, shapes, backend):
+    buffer = engine.Buffer.create(height=height, width=width, backend=backend)
+    buffer.render(shapes)
+    return buffer.to_bytes()
+
+
+@pytest.mark.parametrize("backend", ["python", "coverage"])
+def test_flush_matches_full_render(backend):
+    rng = random.Random(5)
+    shapes = scene(48, 40, count=20)
+    # filled shapes are redone inside the dirty windows too
+    shapes.append(engine.ScriptLoader.build_shape([5, 8, 8, 0, 20, 20, 1]))
+    retained = engine.Scene(height=48, width=40, backend=backend)
+    for shape in shapes:
+        retained.add(shape)
+    retained.flush()
+    assert retained.buffer.to_bytes() == full_render(48, 40, list(retained.shapes.values()), backend)
+    for step in range(15):
+        shape_id = rng.choice(list(retained.shapes))
+        action = step % 3
+        if action == 0:
+            retained.transform(shape_id, Matrix([[1, 0], [0, 1]]), Vector([rng.uniform(-6, 6), rng.uniform(-6, 6)]))
+        elif action == 1:
+            retained.set_transform(shape_id, Affine2D.identity())
+        elif len(retained) > 5:
+            retained.remove(shape_id)
+        retained.flush()
+        assert retained.buffer.to_bytes() == full_render(48, 40, list(retained.shapes.values()), backend)
+
+
+def test_flush_only_touches_dirty_windows():
+    retained = engine.Scene(height=48, width=40)
+    first = retained.add(engine.ScriptLoader.build_shape([4, 3, 3, 0, 10, 10]))
+    retained.add(engine.ScriptLoader.build_shape([4, 3, 3, 0, 38, 30]))
+    retained.flush()
+    retained.transform(first, Matrix([[1, 0], [0, 1]]), Vector([2, 0]))
+    regions = retained.flush()
+    assert len(regions) == 1
+    # the other square spans columns 27 to 33
+    assert regions[0][3] < 27
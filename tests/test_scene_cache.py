@@ -0,0 +1,81 @@
+from libs import engine
+
+SCRIPT = "48 64\n3 12 12 0 24 32\n3 6 6 180 24 32\n"
+
+
+def render(cache, filename, backend):
+    loader = engine.ScriptLoader(filename=filename)
+    key = cache.loader_key(loader)
+    shapes = cache.load_script(loader, key=key)
+    buffer = engine.Buffer.create(height=loader.height, width=loader.width, backend=backend)
+    hit = cache.load_frame(key, buffer)
+    if not hit:
+        buffer.render(shapes)
+        cache.store_frame(key, buffer)
+    return buffer, hit
+
+
+def test_frame_cache_keeps_backends_apart(tmp_path):
+    script = tmp_path / "scene.txt"
+    script.write_text(SCRIPT)
+    cache = engine.SceneCache(str(tmp_path / "cache"))
+
+    binary, hit = render(cache, str(script), "python")
+    assert not hit
+    shaded, hit = render(cache, str(script), "coverage")
+    assert not hit
+    assert shaded.to_bytes() == render(cache, str(script), "coverage")[0].to_bytes()
+    assert max(shaded.to_bytes()) == 255
+
+    again, hit = render(cache, str(script), "python")
+    assert not hit
+    assert again.to_bytes() == binary.to_bytes()
+    assert render(cache, str(script), "python")[1]
+
+
+def test_frame_cache_misses_on_other_threshold(tmp_path):
+    script = tmp_path / "scene.txt"
+    script.write_text(SCRIPT)
+    cache = engine.SceneCache(str(tmp_path / "cache"))
+    buffer, _ = render(cache, str(script), "python")
+    key = cache.loader_key(engine.ScriptLoader(filename=str(script)))
+    other = engine.Buffer.create(height=buffer.height, width=buffer.width, backend="python")
+    assert not cache.load_frame(key, other, threshold=1.5)
+    assert cache.load_frame(key, other)
+
+
+def test_frame_hit_reports_errors_without_decoding_shapes(tmp_path, monkeypatch):
+    script = tmp_path / "scene.txt"
+    script.write_text(SCRIPT + "3 x 12 0 24 32\n")
+    cache = engine.SceneCache(str(tmp_path / "cache"))
+    first, _ = render(cache, str(script), "python")
+
+    def decode_shapes(data, offset):
+        raise AssertionError("shapes decoded on a frame hit")
+        yield
+
+    monkeypatch.setattr(engine.SceneCache, "decode_shapes", staticmethod(decode_shapes))
+    loader = engine.ScriptLoader(filename=str(script))
+    key = cache.loader_key(loader)
+    errors = []
+    shapes = cache.load_script(loader, on_error=lambda exception, details: errors.append((details.line, details.code)), key=key)
+    buffer = engine.Buffer.create(height=loader.height, width=loader.width, backend="python")
+    assert cache.load_frame(key, buffer)
+    assert errors == [(4, "bad-line")]
+    assert buffer.to_bytes() == first.to_bytes()
+
+
+def test_writes_list_the_directory_only_past_the_limit(tmp_path, monkeypatch):
+    cache = engine.SceneCache(str(tmp_path / "cache"), max_bytes=1000)
+    listings = []
+    entries = engine.SceneCache.entries
+    monkeypatch.setattr(engine.SceneCache, "entries", lambda self: listings.append(1) or entries(self))
+    for index in range(3):
+        cache.write(f"{index}", ".frame", bytes(300))
+    # counted once on the first write, then kept up to date
+    assert len(listings) == 1 and cache.size == 900
+    cache.write("0", ".frame", bytes(200))
+    assert len(listings) == 1 and cache.size == 800
+    cache.write("3", ".frame", bytes(300))
+    assert len(listings) == 2
+    assert cache.size == sum(size for _, size, _ in entries(cache)) <= 1000
@@ -0,0 +1,67 @@
+import pytest
+
+from libs import engine
+
+
+def load(tmp_path, text, use_mmap=False):
+    script = tmp_path / "scene.txt"
+    script.write_text(text)
+    errors = []
+    loader = engine.ScriptLoader(str(script), use_mmap=use_mmap)
+    shapes = list(loader.stream_shapes(on_error=lambda exception, details: errors.append(exception)))
+    return loader, shapes, errors
+
+
+@pytest.mark.parametrize("text, message", [
+    ("10.5 64\n4 7 7 0 24 32\n", "Window size parameters should be integer and integer, got <class 'float'> and <class 'int'>. "),
+    ("-1 64\n", "Window size parameters should be integers greater than zero, got -1 and 64. "),
+    ("48\n", "The first line of script should specify the window size. "),
+    ("48 64\n3 12 0 24 32\n", "Invalid script in line 2: incorrect number of parameters. "),
+    ("48 64\n3 12 12 0 24 abc\n", "Invalid script in line 2: invalid input. "),
+])
+def test_format_check_messages(tmp_path, text, message):
+    _, _, errors = load(tmp_path, text)
+    assert errors == ["Error in reading script: " + message]
+
+
+@pytest.mark.parametrize("token", ["nan", "inf", "-inf", "1e999", "__import__('os')", "2*3"])
+def test_non_finite_and_expressions_are_rejected(tmp_path, token):
+    _, shapes, errors = load(tmp_path, f"48 64\n3 12 12 0 24 {token}\n4 5 5 0 10 10\n")
+    assert len(shapes) == 1
+    assert errors == ["Error in reading script: Invalid script in line 2: invalid input. "]
+
+
+def test_numbers_parse_like_python_literals():
+    assert [engine.ScriptLoader.parse_token(x) for x in ["12", "-3", "0.5", "1e2", "+7"]] == [12, -3, 0.5, 100.0, 7]
+    assert isinstance(engine.ScriptLoader.parse_token("12"), int)
+
+
+def test_mmap_and_blank_lines(tmp_path):
+    text = "48 64\n\n3 12 12 0 24 32\n   \n4 5 5 45 10 10\n"
+    plain, plain_shapes, plain_errors = load(tmp_path, text)
+    mapped, mapped_shapes, mapped_errors = load(tmp_path, text, use_mmap=True)
+    assert plain.get_size() == mapped.get_size() == (48, 64)
+    assert plain_errors == mapped_errors == []
+    assert [s.segments() for s in plain_shapes] == [s.segments() for s in mapped_shapes]
+    assert len(plain_shapes) == 2
+
+
+def test_stream_shapes_is_lazy(tmp_path):
+    script = tmp_path / "scene.txt"
+    script.write_text("48 64\n" + "3 12 12 0 24 32\n" * 3 + "bad line\n")
+    loader, errors = engine.ScriptLoader(str(script)), []
+    shapes = loader.stream_shapes(on_error=lambda exception, details: errors.append(exception))
+    assert loader.get_size() == (48, 64)
+    assert errors == []
+    assert len(list(shapes)) == 3 and len(errors) == 1
+
+
+def test_read_script_returns_traceback_text(tmp_path):
+    script = tmp_path / "scene.txt"
+    script.write_text("48 64\n3 12 12 0 24 abc\n4 5 5 0 10 10\n")
+    loader = engine.ScriptLoader(str(script))
+    exceptions, traceback_details = loader.read_script()
+    assert len(loader.get_shapes()) == 1
+    assert exceptions == ["Error in reading script: Invalid script in line 2: invalid input. "]
+    assert all(isinstance(details, str) for details in traceback_details)
+    assert traceback_details[0].startswith("Traceback (most recent call last):")
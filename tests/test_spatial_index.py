@@ -0,0 +1,59 @@
+import random
+
+from libs import engine
+from libs.engine.spatial_index import SegmentGrid
+from tests.test_packed_buffer import scene
+
+
+def linear_table(shapes):
+    return [((key, k), segment) for key, shape in enumerate(shapes) for k, segment in enumerate(shape.segments())]
+
+
+def test_queries_match_linear_scan():
+    rng = random.Random(11)
+    shapes = scene(96, 80, count=30)
+    table = linear_table(shapes)
+    for cell_size in (4, 16, 64):
+        index = SegmentGrid.from_shapes(shapes, cell_size=cell_size)
+        assert len(index) == len(table)
+        for _ in range(200):
+            x, y = rng.uniform(-30, 130), rng.uniform(-30, 110)
+            threshold = rng.choice([0.5, 2.0, 6.0])
+            distances = sorted((engine.Buffer.point_to_segment_distance(x, y, *segment), reference)
+                               for reference, segment in table)
+            assert index.query_point(x, y, threshold) == [hit for hit in distances if hit[0] <= threshold]
+            assert index.nearest_edge(x, y) == distances[0]
+            max_distance = rng.uniform(0, 20)
+            expected = distances[0] if distances[0][0] <= max_distance else None
+            assert index.nearest_edge(x, y, max_distance) == expected
+            x_lo, y_lo = x - rng.uniform(0, 20), y - rng.uniform(0, 20)
+            assert index.query_rect(x_lo, x, y_lo, y) == {
+                reference for reference, (ax, ay, bx, by) in table
+                if min(ax, bx) <= x and max(ax, bx) >= x_lo and min(ay, by) <= y and max(ay, by) >= y_lo
+            }
+
+
+def test_remove_and_reinsert():
+    shapes = scene(48, 40, count=10)
+    index = SegmentGrid.from_shapes(shapes, cell_size=8)
+    index.remove(3)
+    index.insert(4, shapes[0].segments())
+    remaining = [(key, shape) for key, shape in enumerate(shapes) if key != 3]
+    table = [((key, k), segment) for key, shape in remaining
+             for k, segment in enumerate((shapes[0] if key == 4 else shape).segments())]
+    distances = sorted((engine.Buffer.point_to_segment_distance(20, 20, *segment), reference) for reference, segment in table)
+    assert index.nearest_edge(20, 20) == distances[0]
+
+
+def test_pick_matches_linear_scan():
+    shapes = scene(48, 40, count=15)
+    retained = engine.Scene(height=48, width=40)
+    for shape in shapes:
+        retained.add(shape)
+    for i in range(0, 48, 3):
+        for j in range(0, 40, 3):
+            x, y = 48 - i, j
+            hits = sorted((engine.Buffer.point_to_segment_distance(x, y, *segment), key)
+                          for key, shape in enumerate(shapes) for segment in shape.segments())
+            expected = list(dict.fromkeys(key for distance, key in hits if distance <= 0.5))
+            assert retained.pick(i, j) == expected
@@ -0,0 +1,91 @@
+import asyncio
+
+from libs import engine
+from libs.engine.writers import encode_text
+
+SCRIPT = ["40 36", "4 6 6 0 10 10", "bad line", "3 8 8 30 30 20", "6 5 5 0 20 30 1", "5 40 40 0 200 200"]
+
+
+async def lines_of(lines, delay=0.):
+    for line in lines:
+        await asyncio.sleep(delay)
+        yield line + "\n"
+
+
+def replay(output):
+    """Apply the emitted bands to a blank screen, checking the protocol on the way"""
+    assert output[-1] == "end\n"
+    screen = None
+    for chunk in output[:-1]:
+        header, *rows = chunk.splitlines()
+        kind, i_lo, i_hi = header.split()
+        assert kind == "rows" and len(rows) == int(i_hi) - int(i_lo) + 1
+        if screen is None:
+            screen = {}
+        for i, row in enumerate(rows, start=int(i_lo)):
+            screen[i] = row
+    return "".join(screen[i] + "\n" for i in sorted(screen))
+
+
+def render(lines, delay=0., write_delay=0.):
+    output, errors = [], []
+
+    async def write(text):
+        await asyncio.sleep(write_delay)
+        output.append(text)
+
+    renderer = engine.StreamRenderer(on_error=lambda exception, details: errors.append(exception))
+    buffer = asyncio.run(renderer.run(lines_of(lines, delay), write))
+    return renderer, buffer, output, errors
+
+
+def expected_frame():
+    loader_shapes = [engine.ScriptLoader.build_shape(engine.ScriptLoader("").parse_line(line, idx))
+                     for idx, line in enumerate(SCRIPT) if idx and line != "bad line"]
+    buffer = engine.Buffer(height=40, width=36)
+    buffer.render(loader_shapes)
+    return buffer
+
+
+def test_bands_rebuild_the_frame():
+    renderer, buffer, output, errors = render(SCRIPT)
+    expected = expected_frame()
+    assert buffer.to_bytes() == expected.to_bytes()
+    assert replay(output) == encode_text(expected, mode="square")
+    assert errors == ["Error in reading script: Invalid script in line 3: incorrect number of parameters. "]
+    assert renderer.counts["records read"] == len(SCRIPT)
+
+
+def test_slow_consumer_coalesces_bands():
+    renderer, buffer, output, _ = render(SCRIPT + SCRIPT[1:] * 5, write_delay=0.01)
+    assert replay(output) == encode_text(buffer, mode="square")
+    assert renderer.counts["bands coalesced"] > 0
+
+
+def test_bad_header_stops_the_stream():
+    renderer, buffer, output, errors = render(["10.5 64", "4 6 6 0 10 10"])
+    assert buffer is None and output == ["end\n"]
+    assert len(errors) == 1 and "Window size" in errors[0]
+
+
+def test_socket_input():
+    output = []
+
+    async def write(text):
+        output.append(text)
+
+    async def main():
+        ready = asyncio.get_running_loop().create_future()
+        renderer = engine.StreamRenderer()
+        task = asyncio.ensure_future(renderer.run(engine.socket_lines("127.0.0.1", 0, ready.set_result), write))
+        server = await ready
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write("".join(line + "\n" for line in SCRIPT).encode())
+        await writer.drain()
+        writer.close()
+        return await task
+
+    buffer = asyncio.run(main())
+    assert buffer.to_bytes() == expected_frame().to_bytes()
+    assert replay(output) == encode_text(buffer, mode="square")
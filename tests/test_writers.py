@@ -0,0 +1,53 @@
+import struct
+import zlib
+
+import pytest
+
+from libs import engine
+from libs.engine import writers
+from tests.test_packed_buffer import scene
+
+
+def png_pixels(data):
+    offset, idat = 8, b''
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset:offset + 4])
+        if data[offset + 4:offset + 8] == b'IDAT':
+            idat += data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+    return zlib.decompress(idat)
+
+
+@pytest.mark.parametrize("extension", [".png", ".pgm", ".pbm", ".txt"])
+def test_chunked_output_matches_whole_frame(tmp_path, monkeypatch, extension):
+    buffer = engine.Buffer(height=45, width=37)
+    buffer.render(scene(45, 37))
+    whole = writers.encode(buffer, extension)
+    monkeypatch.setattr(writers, "CHUNK_ROWS", 4)
+    monkeypatch.setattr(writers, "IDAT_BYTES", 16)
+    filename = str(tmp_path / ("frame" + extension))
+    writers.write_image(buffer, filename)
+    with open(filename, 'rb') as file_handler:
+        chunked = file_handler.read()
+    if extension == ".png":
+        assert png_pixels(chunked) == png_pixels(whole)
+    else:
+        assert chunked == whole
+
+
+def test_file_backed_canvas_is_written_by_strips(tmp_path, monkeypatch):
+    monkeypatch.setattr(writers, "CHUNK_ROWS", 8)
+    buffer = engine.PackedBuffer(height=45, width=37, filename=str(tmp_path / "canvas.bin"))
+    buffer.render(scene(45, 37))
+    expected = {extension: writers.encode(buffer, extension) for extension in (".png", ".pgm", ".pbm", ".txt")}
+    unpacked = []
+    to_bytes, to_bits = buffer.to_bytes, buffer.to_bits
+    monkeypatch.setattr(buffer, "to_bytes", lambda i_lo=0, i_hi=None: unpacked.append(i_hi - i_lo + 1) or to_bytes(i_lo, i_hi))
+    monkeypatch.setattr(buffer, "to_bits", lambda i_lo=0, i_hi=None: unpacked.append(i_hi - i_lo + 1) or to_bits(i_lo, i_hi))
+    for extension, data in expected.items():
+        filename = str(tmp_path / ("frame" + extension))
+        writers.write_image(buffer, filename)
+        with open(filename, 'rb') as file_handler:
+            assert file_handler.read() == data
+    assert unpacked and max(unpacked) <= 8
+    buffer.close()